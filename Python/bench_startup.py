@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for the cron entry points.
+
+Runs `python -X importtime -c "import <module>"` for each script, reports the
+cumulative import time and the heaviest imports, and appends the result to
+Log/startup_bench.csv so regressions show up against the previous run.
+
+Usage:
+    python3 bench_startup.py            # benchmark stocknews + stock_monitor
+    python3 bench_startup.py --runs 10  # take the best of 10 runs
+"""
+
+import csv
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+RESULTS_FILE = HERE / "Log" / "startup_bench.csv"
+
+# (label, directory, module) for every script started by cron
+TARGETS = [
+    ("stocknews", HERE, "stocknews"),
+    ("stock_monitor", HERE.parent / "Stock_Alert", "stock_monitor"),
+]
+
+
+def parse_importtime(stderr):
+    """Parse -X importtime output into (self_us, cumulative_us, module) rows."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), module.rstrip()))
+    return rows
+
+
+def measure(directory, module):
+    """Import the module once in a fresh interpreter; return (wall_ms, rows)."""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=directory,
+        capture_output=True,
+        text=True,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()
+        raise RuntimeError(error[-1] if error else f"import {module} failed")
+    return wall_ms, parse_importtime(result.stderr)
+
+
+def load_previous():
+    """Return the last recorded row per target from the results file."""
+    previous = {}
+    if RESULTS_FILE.exists():
+        with open(RESULTS_FILE, newline="") as f:
+            for row in csv.DictReader(f):
+                previous[row["target"]] = row
+    return previous
+
+
+def record(rows):
+    """Append benchmark rows to the results file."""
+    RESULTS_FILE.parent.mkdir(parents=True, exist_ok=True)
+    new_file = not RESULTS_FILE.exists()
+    with open(RESULTS_FILE, "a", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["timestamp", "target", "import_ms", "wall_ms"])
+        if new_file:
+            writer.writeheader()
+        writer.writerows(rows)
+
+
+def main():
+    runs = 5
+    if "--runs" in sys.argv:
+        runs = int(sys.argv[sys.argv.index("--runs") + 1])
+
+    previous = load_previous()
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    results = []
+
+    for label, directory, module in TARGETS:
+        try:
+            samples = [measure(directory, module) for _ in range(runs)]
+        except RuntimeError as e:
+            print(f"✗ {label}: {e}")
+            continue
+
+        # Best of N: the first run also pays for writing .pyc files
+        wall_ms, rows = min(samples, key=lambda s: s[0])
+        own = [r for r in rows if r[2].strip() == module]
+        import_ms = own[0][1] / 1000 if own else 0.0
+
+        line = f"{label}: import {import_ms:.1f} ms, interpreter wall {wall_ms:.1f} ms"
+        if label in previous:
+            delta = import_ms - float(previous[label]["import_ms"])
+            line += f" ({delta:+.1f} ms vs {previous[label]['timestamp']})"
+        print(line)
+
+        heaviest = sorted((r for r in rows if r[2].strip() != module), key=lambda r: r[1], reverse=True)
+        for self_us, cumulative_us, name in heaviest[:5]:
+            print(f"    {cumulative_us / 1000:8.1f} ms  {name.strip()}")
+
+        results.append({
+            "timestamp": timestamp,
+            "target": label,
+            "import_ms": f"{import_ms:.1f}",
+            "wall_ms": f"{wall_ms:.1f}",
+        })
+
+    if results:
+        record(results)
+        print(f"Results appended to {RESULTS_FILE}")
+
+
+if __name__ == "__main__":
+    main()
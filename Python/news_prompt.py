@@ -0,0 +1,85 @@
+"""
+Prompt building for the stocknews Gemini summaries.
+
+Keeps the prompt and the response small:
+- near-duplicate articles (same story from several outlets) are dropped
+- descriptions are trimmed so each company's prompt fits a token budget
+- the output cap scales with the number of articles actually summarized
+
+Token counts are a local estimate (~4 characters per token for English
+text), which is close enough for budgeting and costs no API call.
+"""
+
+import math
+import re
+
+CHARS_PER_TOKEN = 4
+PROMPT_TOKEN_BUDGET = 600      # whole prompt, per company
+OUTPUT_TOKENS_PER_ARTICLE = 60  # ~2 bullet lines
+OUTPUT_TOKENS_OVERHEAD = 40
+DUPLICATE_SIMILARITY = 0.6      # Jaccard similarity of title words
+
+PROMPT_HEADER = """Summarize these news articles about {company}:
+Focus on key financial and market-moving information.
+Keep it concise and professional: 1 to 2 bullet lines per article, skip anything not market-relevant.
+Articles to summarize:
+"""
+
+# " - Reuters", " | CNBC" style source suffixes on NewsAPI titles
+_SOURCE_SUFFIX = re.compile(r"\s+[-|–—]\s+[^-|–—]{2,40}$")
+_NON_WORD = re.compile(r"[^a-z0-9 ]+")
+
+
+def estimate_tokens(text):
+    """Rough token count for budgeting."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN) if text else 0
+
+
+def normalize_title(title):
+    """Lowercase, drop the source suffix and punctuation, collapse whitespace."""
+    title = _SOURCE_SUFFIX.sub("", title or "")
+    title = _NON_WORD.sub(" ", title.lower())
+    return " ".join(title.split())
+
+
+def dedup_articles(articles, threshold=DUPLICATE_SIMILARITY):
+    """Drop articles whose normalized title is a near-duplicate of an earlier one."""
+    kept, kept_words = [], []
+    for article in articles:
+        words = set(normalize_title(article.get("title")).split())
+        if any(words and len(words & seen) / len(words | seen) >= threshold for seen in kept_words):
+            continue
+        kept.append(article)
+        kept_words.append(words)
+    return kept
+
+
+def trim_to_tokens(text, budget):
+    """Cut text at a word boundary so it fits within `budget` tokens."""
+    if not text or budget <= 0:
+        return ""
+    max_chars = budget * CHARS_PER_TOKEN
+    text = " ".join(text.split())
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars].rsplit(" ", 1)[0] + "…"
+
+
+def build_prompt(articles, company, token_budget=PROMPT_TOKEN_BUDGET):
+    """Prompt with titles kept whole and descriptions sharing what is left of the budget."""
+    prompt = PROMPT_HEADER.format(company=company)
+    titles = [f"\n{i + 1}. {article['title']}\n" for i, article in enumerate(articles)]
+    remaining = token_budget - estimate_tokens(prompt) - sum(estimate_tokens(t) for t in titles)
+    per_article = remaining // max(len(articles), 1)
+
+    for title, article in zip(titles, articles):
+        prompt += title
+        description = trim_to_tokens(article.get("description"), per_article)
+        if description:
+            prompt += f"   {description}\n"
+    return prompt
+
+
+def output_token_cap(article_count):
+    """max_output_tokens for a digest of `article_count` articles."""
+    return OUTPUT_TOKENS_OVERHEAD + OUTPUT_TOKENS_PER_ARTICLE * article_count
@@ -0,0 +1,257 @@
+"""
+Fill missing PINCODEs in the IFSC data (Notebook/missing_pincode.xlsx) from
+a reference gazetteer of branches with known pincodes: IFSC_PINCODE.xlsx or
+the iob_branches.xlsx written by iob.py.
+
+Each row without a pincode is resolved by, in order:
+0. ifsc     - the pincode of the reference branch with the same IFSC code
+1. address  - a 6-digit pincode written in the ADDRESS field, accepted when
+              its 3-digit prefix is one the reference uses for that state
+2. fuzzy    - the best match of BRANCH and ADDRESS against the reference
+              branch name and CITY + ADDRESS, if it scores >= --min-score
+
+Fuzzy matching never compares a row with the whole reference. Reference rows
+are indexed into blocks by (state, district), state and 3-digit pincode
+prefix. A row is scored against its district block (or its state block when
+the district is unknown) together with the prefix blocks of any pincodes in
+its address. Reference rows without a district (all of iob_branches) are
+placed in the (state, district) that the rest of the reference uses their
+3-digit pincode prefix for, and are always reachable through their prefix
+block. Rows with the same blocks are scored in one rapidfuzz cdist call
+(C++, all cores) rather than pair by pair in Python.
+
+Usage:
+    python3 pincode_matcher.py ../Notebook/missing_pincode.xlsx --reference ../Notebook/IFSC_PINCODE.xlsx
+    python3 pincode_matcher.py missing.xlsx --reference IFSC_PINCODE.xlsx iob_branches.xlsx -o filled.xlsx
+"""
+
+import argparse
+import re
+import time
+from collections import Counter, defaultdict
+
+import numpy as np
+import pandas as pd
+from rapidfuzz import fuzz, process
+
+MIN_SCORE = 75
+QUERY_CHUNK = 1000  # rows scored per cdist call, bounds the score matrix size
+
+PINCODE_RE = re.compile(r"(?<!\d)([1-9]\d{2})\s?(\d{3})(?!\d)")
+NON_ALNUM_RE = re.compile(r"[^A-Z0-9]+")
+
+# Reference column names -> the names used in the IFSC data
+REFERENCE_COLUMNS = {
+    "IFSCODE": "IFSCCODE",
+    "IFSC Code": "IFSCCODE",
+    "Branch Name": "BRANCH",
+    "Address": "ADDRESS",
+}
+
+# Old and alternative state names seen in the two sources
+STATE_ALIASES = {
+    "ORISSA": "ODISHA",
+    "UTTRAKHAND": "UTTARAKHAND",
+    "UTTARANCHAL": "UTTARAKHAND",
+    "PONDICHERRY": "PUDUCHERRY",
+    "NEW DELHI": "DELHI",
+    "NCT OF DELHI": "DELHI",
+}
+
+
+def normalize(text):
+    """Uppercase, '&' -> AND, punctuation to spaces, collapsed whitespace"""
+    if not isinstance(text, str):
+        return ""
+    text = NON_ALNUM_RE.sub(" ", text.upper().replace("&", " AND "))
+    return " ".join(text.split())
+
+
+def normalize_state(state):
+    state = normalize(state)
+    return STATE_ALIASES.get(state, state)
+
+
+def pincode_candidates(address):
+    """6-digit pincodes written in an address ("560 037" and "560037" both count)"""
+    if not isinstance(address, str):
+        return []
+    return ["".join(match) for match in PINCODE_RE.findall(address)]
+
+
+def normalize_ifsc(code):
+    return code.strip().upper() if isinstance(code, str) else ""
+
+
+def valid_pincode(value):
+    value = "" if pd.isna(value) else str(value).strip()
+    value = value[:-2] if value.endswith(".0") else value  # pincodes read back as floats
+    return value if re.fullmatch(r"[1-9]\d{5}", value) else ""
+
+
+def load_reference(paths):
+    """Reference branches with a valid pincode, in the IFSC data's column names"""
+    frames = []
+    for path in paths:
+        df = pd.read_excel(path, dtype=str).rename(columns=REFERENCE_COLUMNS)
+        for column in ("IFSCCODE", "BRANCH", "CITY", "DISTRICT", "STATE", "ADDRESS", "PINCODE"):
+            if column not in df:
+                df[column] = ""
+        # iob_branches has no pincode column, only the address
+        df["PINCODE"] = [valid_pincode(p) or next(iter(pincode_candidates(a)), "")
+                         for p, a in zip(df["PINCODE"], df["ADDRESS"])]
+        df["IFSCCODE"] = [normalize_ifsc(c) for c in df["IFSCCODE"]]
+        frames.append(df[df["PINCODE"] != ""].fillna(""))
+    reference = pd.concat(frames, ignore_index=True)
+    duplicate = reference["IFSCCODE"].duplicated(keep="last") & (reference["IFSCCODE"] != "")
+    return reference[~duplicate].reset_index(drop=True)
+
+
+class ReferenceIndex:
+    """Blocking indexes over the reference plus the normalized strings to score"""
+
+    def __init__(self, reference):
+        self.ifsc = reference["IFSCCODE"].to_numpy()
+        self.pincodes = reference["PINCODE"].to_numpy()
+        self.by_ifsc = {normalize_ifsc(code): i for i, code in enumerate(self.ifsc) if normalize_ifsc(code)}
+        self.branches = [normalize(b) for b in reference["BRANCH"]]
+        self.places = [normalize(f"{c} {a}") for c, a in zip(reference["CITY"], reference["ADDRESS"])]
+
+        states = [normalize_state(s) for s in reference["STATE"]]
+        districts = [normalize(d) for d in reference["DISTRICT"]]
+
+        self.prefixes = defaultdict(set)  # state -> 3-digit pincode prefixes used there
+        prefix_districts = defaultdict(Counter)  # prefix -> (state, district) counts
+        for state, district, pincode in zip(states, districts, self.pincodes):
+            if state:
+                self.prefixes[state].add(pincode[:3])
+            if state and district:
+                prefix_districts[pincode[:3]][(state, district)] += 1
+        self.all_prefixes = {pincode[:3] for pincode in self.pincodes}
+
+        blocks = defaultdict(list)
+        for i, (state, district, pincode) in enumerate(zip(states, districts, self.pincodes)):
+            blocks[("prefix", pincode[:3])].append(i)
+            if not district:
+                # A 3-digit prefix is roughly one sorting district: take the district
+                # the rest of the reference uses it for (in the row's state, if known)
+                located = [key for key, _ in prefix_districts[pincode[:3]].most_common()
+                           if not state or key[0] == state] if pincode[:3] in prefix_districts else []
+                if located:
+                    state, district = located[0]
+            if state:
+                blocks[("state", state)].append(i)
+            if state and district:
+                blocks[("district", state, district)].append(i)
+        self.blocks = {key: np.array(rows) for key, rows in blocks.items()}
+
+    def address_pincode(self, state, candidates):
+        """First address pincode whose prefix the reference uses in `state`"""
+        prefixes = self.prefixes.get(state) or self.all_prefixes
+        return next((c for c in candidates if c[:3] in prefixes), "")
+
+    def block_keys(self, state, district, candidates):
+        """Blocks a row is scored against: district (or state) plus its address pincode prefixes"""
+        keys = [("district", state, district) if ("district", state, district) in self.blocks else ("state", state)]
+        keys += [("prefix", c[:3]) for c in candidates]
+        return tuple(dict.fromkeys(key for key in keys if key in self.blocks))
+
+    def rows(self, keys):
+        return np.unique(np.concatenate([self.blocks[key] for key in keys]))
+
+
+def score_block(index, rows, branches, places):
+    """Best reference row and its score for each query, scored against one block"""
+    branch_scores = process.cdist(branches, [index.branches[i] for i in rows],
+                                  scorer=fuzz.token_sort_ratio, dtype=np.uint8, workers=-1)
+    place_scores = process.cdist(places, [index.places[i] for i in rows],
+                                 scorer=fuzz.token_set_ratio, dtype=np.uint8, workers=-1)
+    scores = (branch_scores.astype(np.float32) + place_scores) / 2
+    best = scores.argmax(axis=1)
+    return rows[best], scores[np.arange(len(best)), best]
+
+
+def fill_pincodes(missing, reference, min_score=MIN_SCORE):
+    """Copy of `missing` with PINCODE filled where possible, plus PINCODE_SOURCE, MATCH_SCORE and MATCHED_IFSC"""
+    index = ReferenceIndex(reference)
+    result = missing.copy()
+    pincodes = [valid_pincode(p) for p in result["PINCODE"]]
+    sources = ["existing" if p else "" for p in pincodes]
+    match_scores = [np.nan] * len(result)
+    matched_ifsc = [""] * len(result)
+
+    states = [normalize_state(s) for s in result["STATE"]]
+    districts = [normalize(d) for d in result["DISTRICT"]]
+    candidates = [pincode_candidates(a) for a in result["ADDRESS"]]
+
+    # Stage 0: same IFSC code in the reference
+    for i, code in enumerate(result["IFSCCODE"]):
+        row = index.by_ifsc.get(normalize_ifsc(code))
+        if not pincodes[i] and row is not None:
+            pincodes[i] = index.pincodes[row]
+            sources[i] = "ifsc"
+            matched_ifsc[i] = index.ifsc[row]
+
+    # Stage 1: pincode written in the address
+    for i, pincode in enumerate(pincodes):
+        if not pincode:
+            pincodes[i] = index.address_pincode(states[i], candidates[i])
+            sources[i] = "address" if pincodes[i] else ""
+
+    # Stage 2: fuzzy match, one cdist call per set of blocks (chunked)
+    by_blocks = defaultdict(list)
+    for i, pincode in enumerate(pincodes):
+        if not pincode:
+            keys = index.block_keys(states[i], districts[i], candidates[i])
+            if keys:
+                by_blocks[keys].append(i)
+
+    branches = [normalize(b) for b in result["BRANCH"]]
+    places = [normalize(a) for a in result["ADDRESS"]]
+    for keys, queries in by_blocks.items():
+        rows = index.rows(keys)
+        for start in range(0, len(queries), QUERY_CHUNK):
+            chunk = queries[start:start + QUERY_CHUNK]
+            best_rows, best_scores = score_block(index, rows, [branches[i] for i in chunk], [places[i] for i in chunk])
+            for i, row, score in zip(chunk, best_rows, best_scores):
+                if score >= min_score:
+                    pincodes[i] = index.pincodes[row]
+                    sources[i] = "fuzzy"
+                    match_scores[i] = round(float(score), 1)
+                    matched_ifsc[i] = index.ifsc[row]
+
+    result["PINCODE"] = [p or None for p in pincodes]
+    result["PINCODE_SOURCE"] = sources
+    result["MATCH_SCORE"] = match_scores
+    result["MATCHED_IFSC"] = matched_ifsc
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fill missing pincodes from addresses and a branch gazetteer")
+    parser.add_argument("missing", help="Excel file with IFSCCODE, BRANCH, ADDRESS, PINCODE, DISTRICT, STATE")
+    parser.add_argument("--reference", nargs="+", required=True,
+                        help="Excel gazetteer(s) with known pincodes (IFSC_PINCODE.xlsx, iob_branches.xlsx)")
+    parser.add_argument("-o", "--output", default="pincode_filled.xlsx")
+    parser.add_argument("--min-score", type=float, default=MIN_SCORE, help="Fuzzy match threshold (0-100)")
+    args = parser.parse_args()
+
+    missing = pd.read_excel(args.missing, dtype=str)
+    reference = load_reference(args.reference)
+    print(f"Loaded {len(missing)} rows and {len(reference)} reference branches")
+
+    started = time.perf_counter()
+    result = fill_pincodes(missing, reference, args.min_score)
+    elapsed = time.perf_counter() - started
+
+    counts = result["PINCODE_SOURCE"].replace("", "unresolved").value_counts()
+    for source, count in counts.items():
+        print(f"  {source:<10} {count:>7}")
+    print(f"Matched in {elapsed:.1f}s")
+
+    result.to_excel(args.output, index=False)
+    print(f"Saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
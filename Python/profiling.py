@@ -0,0 +1,175 @@
+"""
+Profiling mode shared by stocknews.py and Stock_Alert/stock_monitor.py (--profile).
+
+A ProfileSession wraps one run and writes to Log/profiles/<name>/<timestamp>/:
+- profile.prof   cProfile output (snakeviz, flameprof, `python -m pstats`)
+- stats.txt      top functions by cumulative time
+- stacks.folded  sampled call stacks in folded format (flamegraph.pl, speedscope)
+- summary.json   per-stage wall time, CPU time, wait time and tracemalloc peak
+
+Stages are existing functions wrapped with instrument(), so the code being
+profiled needs no changes. CPU time is process-wide, so work done in helper
+threads (yfinance downloads with threads=True) counts as CPU rather than wait;
+wall - cpu for a stage is time spent waiting (network, disk, sleeps). Each run
+is compared with the previous one.
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+from functools import wraps
+
+SAMPLE_INTERVAL = 0.005  # seconds between stack samples
+
+
+class StackSampler(threading.Thread):
+    """Samples one thread's call stack at a fixed interval into folded-stack counts"""
+
+    def __init__(self, thread_id, interval=SAMPLE_INTERVAL):
+        super().__init__(daemon=True, name="stack-sampler")
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts = Counter()
+        self.stop_event = threading.Event()
+
+    def run(self):
+        while not self.stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.counts[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self.stop_event.set()
+        self.join()
+
+
+class ProfileSession:
+    def __init__(self, name, log_dir):
+        self.name = name
+        self.base_dir = os.path.join(log_dir, "profiles", name)
+        self.run_dir = os.path.join(self.base_dir, datetime.now().strftime("%Y%m%d-%H%M%S-%f"))
+        self.stages = {}
+        self.patched = []
+        self.profiler = cProfile.Profile()
+        self.sampler = StackSampler(threading.get_ident())
+
+    def instrument(self, owner, attr, stage):
+        """Replace owner.attr (a function or method) with a version that records `stage` stats"""
+        func = getattr(owner, attr)
+        stats = self.stages.setdefault(stage, {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0, "peak_mb": 0.0})
+
+        @wraps(func)
+        def timed(*args, **kwargs):
+            self._push_peak()
+            wall, cpu = time.perf_counter(), time.process_time()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stats["calls"] += 1
+                stats["wall_s"] += time.perf_counter() - wall
+                stats["cpu_s"] += time.process_time() - cpu
+                stats["peak_mb"] = max(stats["peak_mb"], self._pop_peak() / 1e6)
+
+        self.patched.append((owner, attr, func))
+        setattr(owner, attr, timed)
+
+    # Stages nest (get_model runs inside summarize_news_with_gemini), but
+    # tracemalloc has a single peak counter. Each stage resets it on entry, so
+    # the peak seen so far is carried on a stack and folded back into the
+    # enclosing stage (and the session total) on exit.
+    def _push_peak(self):
+        self.peaks[-1] = max(self.peaks[-1], tracemalloc.get_traced_memory()[1])
+        self.peaks.append(0)
+        tracemalloc.reset_peak()
+
+    def _pop_peak(self):
+        peak = max(self.peaks.pop(), tracemalloc.get_traced_memory()[1])
+        self.peaks[-1] = max(self.peaks[-1], peak)
+        return peak
+
+    def __enter__(self):
+        self.wall, self.cpu = time.perf_counter(), time.process_time()
+        tracemalloc.start()
+        self.peaks = [0]
+        self.sampler.start()
+        self.profiler.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.disable()
+        self.sampler.stop()
+        total = {
+            "wall_s": time.perf_counter() - self.wall,
+            "cpu_s": time.process_time() - self.cpu,
+            "peak_mb": max(self.peaks[0], tracemalloc.get_traced_memory()[1]) / 1e6,
+        }
+        tracemalloc.stop()
+        for owner, attr, func in self.patched:
+            setattr(owner, attr, func)
+
+        for stats in self.stages.values():
+            stats["wait_s"] = max(stats["wall_s"] - stats["cpu_s"], 0.0)
+        summary = {"name": self.name, "total": total, "stages": self.stages}
+        previous = self._previous_summary()
+        self._write(summary)
+        self._report(summary, previous)
+        return False
+
+    def _previous_summary(self):
+        if not os.path.isdir(self.base_dir):
+            return None
+        runs = sorted(d for d in os.listdir(self.base_dir) if os.path.isfile(os.path.join(self.base_dir, d, "summary.json")))
+        if not runs:
+            return None
+        with open(os.path.join(self.base_dir, runs[-1], "summary.json")) as f:
+            return json.load(f)
+
+    def _write(self, summary):
+        os.makedirs(self.run_dir, exist_ok=True)
+        self.profiler.dump_stats(os.path.join(self.run_dir, "profile.prof"))
+
+        stats_text = io.StringIO()
+        pstats.Stats(self.profiler, stream=stats_text).sort_stats("cumulative").print_stats(40)
+        with open(os.path.join(self.run_dir, "stats.txt"), "w") as f:
+            f.write(stats_text.getvalue())
+
+        with open(os.path.join(self.run_dir, "stacks.folded"), "w") as f:
+            for stack, count in self.sampler.counts.most_common():
+                f.write(f"{stack} {count}\n")
+
+        with open(os.path.join(self.run_dir, "summary.json"), "w") as f:
+            json.dump(summary, f, indent=2)
+
+    def _report(self, summary, previous):
+        def delta(new, old):
+            return f" ({new - old:+.2f})" if old is not None else ""
+
+        old_stages = previous["stages"] if previous else {}
+        print(f"\n--- Profile: {self.name} ---")
+        print(f"{'stage':<20}{'calls':>7}{'wall s':>16}{'cpu s':>16}{'wait s':>16}{'peak MB':>16}")
+        rows = list(summary["stages"].items()) + [("TOTAL", summary["total"])]
+        for stage, stats in rows:
+            old = (previous["total"] if previous else {}) if stage == "TOTAL" else old_stages.get(stage, {})
+            wait = stats.get("wait_s", stats["wall_s"] - stats["cpu_s"])
+            old_wait = old.get("wait_s", old["wall_s"] - old["cpu_s"]) if old else None
+            print(f"{stage:<20}{stats.get('calls', ''):>7}"
+                  f"{stats['wall_s']:>8.2f}{delta(stats['wall_s'], old.get('wall_s')):>8}"
+                  f"{stats['cpu_s']:>8.2f}{delta(stats['cpu_s'], old.get('cpu_s')):>8}"
+                  f"{wait:>8.2f}{delta(wait, old_wait):>8}"
+                  f"{stats['peak_mb']:>8.1f}{delta(stats['peak_mb'], old.get('peak_mb')):>8}")
+        if previous:
+            print("(changes in brackets are against the previous profiled run)")
+        print(f"Profile written to {self.run_dir}")
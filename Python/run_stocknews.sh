@@ -3,13 +3,27 @@
 # Stock News Automation Script
 # This script runs the Python stock news program
 
-# Set the path to your Python environment (adjust as needed)
-PYTHON_PATH="/Library/Frameworks/Python.framework/Versions/3.9/bin/python3.9"
-SCRIPT_PATH="/Users/karanchanana/stocknews.py"
-LOG_PATH="/Users/karanchanana/stocknews.log"
+# Paths default to this script's directory; override with environment variables
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+PYTHON_PATH="${PYTHON_PATH:-python3}"
+SCRIPT_PATH="${SCRIPT_PATH:-$SCRIPT_DIR/stocknews.py}"
+LOG_PATH="${LOG_PATH:-$SCRIPT_DIR/Log/stocknews.log}"
+
+LOG_MAX_BYTES=5242880   # rotate once the log passes 5 MB
+LOG_BACKUPS=7           # keep stocknews.log.1.gz ... stocknews.log.7.gz
 
 # Change to the script directory
-cd /Users/karanchanana
+cd "$SCRIPT_DIR"
+mkdir -p "$(dirname "$LOG_PATH")"
+
+# Rotate and compress the log before appending to it
+if [ -f "$LOG_PATH" ] && [ "$(wc -c < "$LOG_PATH")" -gt "$LOG_MAX_BYTES" ]; then
+    rm -f "$LOG_PATH.$LOG_BACKUPS.gz"
+    for i in $(seq $((LOG_BACKUPS - 1)) -1 1); do
+        [ -f "$LOG_PATH.$i.gz" ] && mv "$LOG_PATH.$i.gz" "$LOG_PATH.$((i + 1)).gz"
+    done
+    gzip -c "$LOG_PATH" > "$LOG_PATH.1.gz" && : > "$LOG_PATH"
+fi
 
 # Add timestamp to log
 echo "===========================================" >> "$LOG_PATH"
@@ -1,14 +1,16 @@
 import os
+import sys
+import contextlib
 import smtplib
 import ssl
 from email.mime.text import MIMEText
 from datetime import datetime, timedelta
-import time
 
-import requests
-import google.generativeai as genai
+# requests and google.generativeai are imported lazily where they are used,
+# so a cron start does not pay for loading the Gemini SDK up front.
 from dotenv import load_dotenv
-import schedule
+
+from news_prompt import build_prompt, dedup_articles, output_token_cap
 
 # --- Configuration ---
 load_dotenv() # Load environment variables from .env file
@@ -36,33 +38,48 @@ RECIPIENT_EMAIL = os.getenv("RECIPIENT_EMAIL")
 NEWS_API_ENDPOINT = "https://newsapi.org/v2/everything"
 MAX_ARTICLES_TO_PROCESS = 5 # Number of recent articles to consider for summary
 
-# Configure Gemini
-genai.configure(api_key=GEMINI_API_KEY)
+# (company name, ticker) pairs covered by the daily news digest
+COMPANIES = [
+    ("United Healthcare", "UNH"),
+    ("Palantir Technologies Inc", "PLTR"),
+    ("NVIDIA Corp", "NVDA"),
+    ("Lockheed Martin Corp", "LMT"),
+    ("Rivian Automotive Inc", "RIVN"),
+    ("Alphabet Inc Class C", "GOOG"),
+    ("Tesla Inc", "TSLA"),
+]
+
+# Gemini is configured on first use (see get_model)
+MODEL_NAME = "gemini-1.5-pro"  # Using the stable version identifier
 generation_config = {
     "temperature": 0.7,
     "top_p": 1,
     "top_k": 1,
-    "max_output_tokens": 2048,  # Increased for better summaries
+    "max_output_tokens": 2048,  # upper bound; each call is capped by output_token_cap
 }
 
-# Simplified model configuration
-model = genai.GenerativeModel('gemini-1.5-pro')  # Using the stable version identifier
+_model = None
 
 # --- Functions ---
+def get_model():
+    """Import the Gemini SDK and build the model on first use."""
+    global _model
+    if _model is None:
+        import google.generativeai as genai
+        genai.configure(api_key=GEMINI_API_KEY)
+        _model = genai.GenerativeModel(MODEL_NAME)
+    return _model
+
 def test_gemini_connection():
-    """Test the Gemini API connection"""
+    """Test the Gemini API connection with a metadata lookup (no generation call)"""
     try:
-        # for model in genai.list_models():
-        #     if "gemini" in model.name:
-        #         print(f"\nModel: {model.name}")
-        #         print(f"Display Name: {model.display_name}")
-        #         print(f"Description: {model.description}")
-        #         print(f"Generation Methods: {model.supported_generation_methods}")
-        #         print("-" * 50)
-        response = model.generate_content("Test connection to Gemini API")
-        if response and response.text:
-            print("✓ Gemini API connection successful")
+        import google.generativeai as genai
+        get_model()  # configures the SDK with our API key
+        model_info = genai.get_model(f"models/{MODEL_NAME}")
+        if "generateContent" in model_info.supported_generation_methods:
+            print(f"✓ Gemini API connection successful ({model_info.display_name})")
             return True
+        print(f"✗ {MODEL_NAME} does not support generateContent")
         return False
     except Exception as e:
         print(f"✗ Gemini API connection failed: {e}")
@@ -71,6 +88,8 @@ def test_gemini_connection():
 
 def get_latest_stock_news(COMPANY_NAME, COMPANY_TICKER):
     """Fetches the latest news articles for the specified company."""
+    import requests
+
     print(f"Fetching news for {COMPANY_NAME}...")
     articles_data = []
     today = datetime.now()
@@ -105,8 +124,9 @@ def get_latest_stock_news(COMPANY_NAME, COMPANY_TICKER):
                         "url": article.get("url"),
                         "published_at": article.get("publishedAt")
                     })
-                    if len(articles_data) >= MAX_ARTICLES_TO_PROCESS:
-                        break
+            # Drop the same story from other outlets before capping, so duplicates
+            # do not crowd out distinct articles
+            articles_data = dedup_articles(articles_data)[:MAX_ARTICLES_TO_PROCESS]
             print(f"Found {len(articles_data)} relevant articles.")
             return articles_data
         else:
@@ -119,31 +139,34 @@ def get_latest_stock_news(COMPANY_NAME, COMPANY_TICKER):
         print(f"An unexpected error occurred while fetching news: {e}")
         return []
 
-def summarize_news_with_gemini(articles,COMPANY_NAME):
-    """Summarizes a list of articles using Gemini API."""
+def summarize_news_with_gemini(articles, COMPANY_NAME, on_chunk=None):
+    """Summarizes a list of articles using Gemini API, calling on_chunk with each streamed piece of text."""
     if not articles:
         return None
 
     print("Summarizing news with Gemini...")
     
     try:
-        prompt = f"""Summarize these news articles about {COMPANY_NAME}:
-        Focus on key financial and market-moving information.
-        Keep it concise and professional using 3 to 5 lines per article.
-        Use bullet points for clarity.
-        Articles to summarize:
-        """
-        
-        for i, article in enumerate(articles):
-            prompt += f"\n{i+1}. {article['title']}\n"
-            if article.get('description'):
-                prompt += f"   {article['description']}\n"
-
-        response = model.generate_content(prompt)
-        
-        if response and response.text:
+        prompt = build_prompt(articles, COMPANY_NAME)
+        config = dict(generation_config,
+                      max_output_tokens=min(output_token_cap(len(articles)), generation_config["max_output_tokens"]))
+
+        # Stream the response so the summary is assembled as it is generated
+        # instead of waiting for the whole completion
+        parts = []
+        for chunk in get_model().generate_content(prompt, generation_config=config, stream=True):
+            try:
+                text = chunk.text
+            except ValueError:  # chunk with no text part (e.g. a safety stop)
+                continue
+            parts.append(text)
+            if on_chunk:
+                on_chunk(text)
+
+        summary = "".join(parts).strip()
+        if summary:
             print("Summary generated successfully.")
-            return response.text.strip()
+            return summary
         else:
             print("No valid response from Gemini API.")
             return None
@@ -184,12 +207,19 @@ def job(COMPANY_NAME, COMPANY_TICKER):
         print(f"No new relevant news found for {COMPANY_NAME}. No email will be sent.")
         return
 
-    summary = summarize_news_with_gemini(articles,COMPANY_NAME)
+    # The email body is assembled as the summary streams in
+    email_body = [f"Good morning,\n\nHere is your executive summary of the latest stock market news for {COMPANY_NAME}:\n\n"]
+
+    def on_chunk(text):
+        email_body.append(text if len(email_body) > 1 else text.lstrip())
+        print(text, end="", flush=True)
+
+    summary = summarize_news_with_gemini(articles, COMPANY_NAME, on_chunk=on_chunk)
+    print()
 
     if summary:
         email_subject = f"Executive News Summary: {COMPANY_NAME} - {datetime.now().strftime('%Y-%m-%d')}"
-        email_body = f"Good morning,\n\nHere is your executive summary of the latest stock market news for {COMPANY_NAME}:\n\n"
-        email_body += f"{summary}\n\n"
+        email_body = "".join(email_body).rstrip() + "\n\n"
         email_body += "Sources:\n"
         for article in articles:
             email_body += f"- {article['title']}: {article['url']}\n"
@@ -217,41 +247,41 @@ def print_env_vars():
     print()
 
 
-# --- Scheduler ---
+def run_all_jobs():
+    """Run the news job for every company in COMPANIES."""
+    print("Script started. Running daily stock news job...")
+    for company_name, company_ticker in COMPANIES:
+        job(company_name, company_ticker)
+    print("--- ALL JOBS COMPLETED ---")
+
+
+def profile_session():
+    """ProfileSession with the news stages instrumented (for --profile)."""
+    from profiling import ProfileSession
+
+    session = ProfileSession("stocknews", os.path.join(os.path.dirname(os.path.abspath(__file__)), "Log"))
+    module = sys.modules[__name__]
+    session.instrument(module, "get_model", "gemini_setup")
+    session.instrument(module, "test_gemini_connection", "connection_check")
+    session.instrument(module, "get_latest_stock_news", "fetch_news")
+    session.instrument(module, "summarize_news_with_gemini", "summarize")
+    session.instrument(module, "send_email", "send_email")
+    return session
+
+
+# --- Entry point ---
+# Runs once per invocation; Stock_Alert/job_daemon.py schedules it on trading days.
 if __name__ == "__main__":
     try:
         check_environment()
         print_env_vars()
-        # Test Gemini connection before proceeding
-        if not test_gemini_connection():
-            raise Exception("Failed to connect to Gemini API")
-           
-        print("Script started. Running daily stock news job...")
-        # --- DAILY JOB EXECUTION ---
-        job("United Healthcare","UNH" ) 
-        job("Palantir Technologies Inc","PLTR" ) 
-        job("NVIDIA Corp","NVDA" ) 
-        job("Lockheed Martin Corp","LMT" ) 
-        job("Rivian Automotive Inc","RIVN" )
-        job("Alphabet Inc Class C","GOOG" ) 
-        job("Tesla Inc","TSLA" ) 
-        print("--- ALL JOBS COMPLETED ---")
-        
-        # For more concise weekday scheduling:
-        # for day in ["monday", "tuesday", "wednesday", "thursday", "friday"]:
-        #     schedule.every().day.at("09:00").tag(day).do(job) # This schedules for ALL days
-        # A better way for weekdays:
-        # schedule.every().weekday.at("09:00").do(job) # This is simpler but 'weekday' isn't a direct method
-        # The individual .monday, .tuesday etc. is most explicit and reliable with the `schedule` library
-
-        #print("Scheduler is running. Jobs scheduled for 9:00 AM weekdays.")
-        #print(f"Next run for a job: {schedule.next_run()}")
-
-        #while True:
-        #    schedule.run_pending()
-        #    time.sleep(60) # Check every 60 seconds
+        # --profile writes cProfile/flamegraph/memory output to Log/profiles/stocknews/
+        with profile_session() if "--profile" in sys.argv else contextlib.nullcontext():
+            # Test Gemini connection before proceeding (skip with --skip-check for fast starts)
+            if "--skip-check" not in sys.argv and not test_gemini_connection():
+                raise Exception("Failed to connect to Gemini API")
+               
+            run_all_jobs()
     except Exception as e:
         print(f"Startup error: {e}")
         exit(1)
-
-
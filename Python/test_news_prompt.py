@@ -0,0 +1,39 @@
+from news_prompt import (build_prompt, dedup_articles, estimate_tokens, normalize_title,
+                         output_token_cap, trim_to_tokens)
+
+
+def article(title, description=""):
+    return {"title": title, "description": description, "url": "https://example.com"}
+
+
+def test_normalize_title_drops_source_and_punctuation():
+    assert normalize_title("NVIDIA beats estimates, shares jump! - Reuters") == "nvidia beats estimates shares jump"
+
+
+def test_dedup_articles_keeps_first_of_near_duplicates():
+    articles = [
+        article("Tesla recalls 200,000 vehicles over camera issue - Reuters"),
+        article("Tesla recalls 200,000 vehicles over rear camera issue | CNBC"),
+        article("Tesla opens new factory in Mexico"),
+    ]
+    kept = dedup_articles(articles)
+    assert [a["title"] for a in kept] == [articles[0]["title"], articles[2]["title"]]
+
+
+def test_trim_to_tokens_cuts_at_word_boundary():
+    text = "word " * 100
+    trimmed = trim_to_tokens(text, 10)
+    assert trimmed.endswith("…")
+    assert len(trimmed) <= 10 * 4 + 1
+    assert trim_to_tokens("short text", 10) == "short text"
+
+
+def test_build_prompt_fits_budget():
+    articles = [article(f"Headline number {i}", "long description " * 200) for i in range(5)]
+    prompt = build_prompt(articles, "Palantir", token_budget=400)
+    assert estimate_tokens(prompt) <= 400
+    assert all(f"Headline number {i}" in prompt for i in range(5))
+
+
+def test_output_token_cap_scales_with_articles():
+    assert output_token_cap(5) > output_token_cap(1)
@@ -0,0 +1,88 @@
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("rapidfuzz")
+
+from pincode_matcher import fill_pincodes, normalize_state, pincode_candidates
+
+
+@pytest.fixture
+def reference():
+    return pd.DataFrame({
+        "IFSCCODE": ["SBIN0000001", "SBIN0000002", "UCBA0000003"],
+        "BRANCH": ["Koramangala", "Indiranagar", "Adampur"],
+        "CITY": ["Bangalore", "Bangalore", "Mandi Adampur"],
+        "DISTRICT": ["Bangalore Urban", "Bangalore Urban", "Hisar"],
+        "STATE": ["Karnataka", "Karnataka", "Haryana"],
+        "ADDRESS": ["80 feet road, Koramangala", "100 feet road, HAL 2nd stage", "Main bazar, mandi adampur"],
+        "PINCODE": ["560034", "560038", "125052"],
+    })
+
+
+def missing_rows(*rows):
+    return pd.DataFrame(rows, columns=["IFSCCODE", "BRANCH", "ADDRESS", "PINCODE", "DISTRICT", "STATE"])
+
+
+def test_pincode_candidates():
+    assert pincode_candidates("NO 12, MG ROAD, BANGALORE 560 001") == ["560001"]
+    assert pincode_candidates("PLOT 1234567, SECTOR 5") == []
+    assert pincode_candidates(None) == []
+
+
+def test_normalize_state_aliases():
+    assert normalize_state("Orissa") == normalize_state("ODISHA")
+    assert normalize_state("Jammu & Kashmir") == "JAMMU AND KASHMIR"
+
+
+def test_address_pincode_is_used_when_valid_for_state(reference):
+    result = fill_pincodes(missing_rows(("X1", "JAYANAGAR", "4TH BLOCK, BANGALORE - 560011", None,
+                                         "BANGALORE URBAN", "KARNATAKA")), reference)
+    assert result.loc[0, "PINCODE"] == "560011"
+    assert result.loc[0, "PINCODE_SOURCE"] == "address"
+
+
+def test_fuzzy_match_within_district(reference):
+    result = fill_pincodes(missing_rows(("X2", "INDIRA NAGAR", "100 FEET ROAD HAL II STAGE", None,
+                                         "BANGALORE URBAN", "KARNATAKA")), reference)
+    assert result.loc[0, "PINCODE"] == "560038"
+    assert result.loc[0, "MATCHED_IFSC"] == "SBIN0000002"
+
+
+def test_unmatched_and_existing_rows(reference):
+    result = fill_pincodes(missing_rows(("X3", "ZZZ", "QQQ", None, "NOWHERE", "NOWHERE"),
+                                        ("X4", "ANY", "ANY", "110001", "NEW DELHI", "DELHI")), reference)
+    assert result["PINCODE_SOURCE"].tolist() == ["", "existing"]
+    assert pd.isna(result.loc[0, "PINCODE"])
+
+
+def test_reference_rows_without_state_are_blocked_by_prefix(reference):
+    from pincode_matcher import ReferenceIndex
+
+    # iob_branches style rows: no state or district, pincode taken from the address
+    iob = pd.DataFrame({
+        "IFSCCODE": ["IOBA0000004", "IOBA0000005"],
+        "BRANCH": ["Jayanagar", "Chandni Chowk"],
+        "CITY": ["", ""], "DISTRICT": ["", ""], "STATE": ["", ""],
+        "ADDRESS": ["9th block Jayanagar, Bangalore 560069", "Chandni Chowk, Delhi 110006"],
+        "PINCODE": ["560069", "110006"],
+    })
+    index = ReferenceIndex(pd.concat([reference, iob], ignore_index=True))
+
+    assert ("district", "", "") not in index.blocks and ("state", "") not in index.blocks
+    # Placed in the district that uses the 560 prefix
+    keys = index.block_keys("KARNATAKA", "BANGALORE URBAN", [])
+    assert 3 in index.rows(keys)
+    # Unknown prefix: only its own prefix block, never the whole reference
+    assert index.block_keys("", "", ["110001"]) == (("prefix", "110"),)
+    assert index.rows(index.block_keys("", "", ["110001"])).tolist() == [4]
+    assert index.block_keys("", "", []) == ()
+
+
+
+def test_exact_ifsc_match_comes_first(reference):
+    # Address pincode and branch name both point elsewhere; the IFSC code wins
+    result = fill_pincodes(missing_rows((" sbin0000001 ", "INDIRANAGAR", "HAL 2ND STAGE 560038", None,
+                                         "BANGALORE URBAN", "KARNATAKA")), reference)
+    assert result.loc[0, "PINCODE"] == "560034"
+    assert result.loc[0, "PINCODE_SOURCE"] == "ifsc"
+    assert result.loc[0, "MATCHED_IFSC"] == "SBIN0000001"
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Vectorized historical backtest for the stock monitor alert rules
+- Loads daily closes for the whole universe from local files into one
+  (days x tickers) matrix
+- Evaluates the daily-drop and consecutive-decline rules for every day in a
+  single pass of array operations, then sweeps a grid of thresholds
+- Reports alert frequency and forward-return statistics per setting
+
+Usage:
+    python3 backtest.py --data prices/                 # directory of <TICKER>.csv files
+    python3 backtest.py --data closes.parquet          # wide file: Date index, one column per ticker
+    python3 backtest.py --data closes.npz              # cache written by --save-npz
+    python3 backtest.py --synthetic 10000x2520         # random-walk data for timing runs
+    python3 backtest.py --data prices/ --thresholds 0.03,0.05 --days 2,3,4 --output sweep.csv
+"""
+
+import argparse
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from stock_monitor import StockMonitor
+
+DEFAULT_THRESHOLDS = [round(t, 2) for t in np.arange(0.01, 0.105, 0.01)]
+DEFAULT_DAYS = list(range(1, 11))
+DEFAULT_HORIZONS = [1, 5, 20]
+
+# Tickers evaluated per block; bounds peak memory on very large universes
+CHUNK_SIZE = 2000
+
+
+def load_close_matrix(path: str) -> Tuple[np.ndarray, List[str], np.ndarray]:
+    """Load closes as (dates, tickers, float32 matrix of shape days x tickers)"""
+    path = Path(path)
+    if path.suffix == ".npz":
+        data = np.load(path, allow_pickle=False)
+        return data["dates"], list(data["tickers"]), data["closes"]
+
+    if path.is_dir():
+        series = {}
+        for csv_file in sorted(path.glob("*.csv")):
+            frame = pd.read_csv(csv_file, index_col=0, usecols=lambda c: c in ("Date", "Close"))
+            series[csv_file.stem] = frame["Close"]
+        frame = pd.concat(series, axis=1)
+    elif path.suffix == ".parquet":
+        frame = pd.read_parquet(path)
+    else:
+        frame = pd.read_csv(path, index_col=0)
+
+    frame.index = pd.to_datetime(frame.index, utc=True).tz_localize(None).normalize()
+    frame = frame.sort_index()
+    closes = np.ascontiguousarray(frame.to_numpy(dtype=np.float32))
+    return frame.index.to_numpy(dtype="datetime64[D]"), [str(c) for c in frame.columns], closes
+
+
+def synthetic_closes(n_tickers: int, n_days: int, seed: int = 0) -> Tuple[np.ndarray, List[str], np.ndarray]:
+    """Random-walk closes for benchmarking the sweep"""
+    rng = np.random.default_rng(seed)
+    log_returns = rng.normal(0.0003, 0.02, size=(n_days, n_tickers)).astype(np.float32)
+    closes = 100 * np.exp(np.cumsum(log_returns, axis=0))
+    dates = np.datetime64("2000-01-03") + np.arange(n_days)
+    return dates, [f"T{i}" for i in range(n_tickers)], closes.astype(np.float32)
+
+
+def daily_returns(closes: np.ndarray) -> np.ndarray:
+    """Close-to-close return per day (first row NaN)"""
+    returns = np.full_like(closes, np.nan)
+    returns[1:] = closes[1:] / closes[:-1] - 1
+    return returns
+
+
+def down_streaks(closes: np.ndarray) -> np.ndarray:
+    """Length of the run of down closes ending on each day"""
+    down = np.zeros(closes.shape, dtype=bool)
+    down[1:] = closes[1:] < closes[:-1]
+    count = np.cumsum(down, axis=0, dtype=np.int32)
+    # Count at the most recent non-down day; the streak is the count since then
+    last_reset = np.maximum.accumulate(np.where(down, 0, count), axis=0)
+    return count - last_reset
+
+
+def forward_returns(closes: np.ndarray, horizon: int) -> np.ndarray:
+    """Return from each day's close to the close `horizon` sessions later (NaN at the end)"""
+    forward = np.full_like(closes, np.nan)
+    forward[:-horizon] = closes[horizon:] / closes[:-horizon] - 1
+    return forward
+
+
+def sweep(closes: np.ndarray, thresholds: List[float], day_counts: List[int],
+          horizons: List[int], chunk_size: int = CHUNK_SIZE) -> Tuple[pd.DataFrame, dict]:
+    """Evaluate every (threshold, days) setting; an alert is either rule firing, as in the live monitor"""
+    n_settings = len(thresholds) * len(day_counts)
+    alerts = np.zeros(n_settings, dtype=np.int64)
+    drop_alerts = np.zeros(n_settings, dtype=np.int64)
+    streak_alerts = np.zeros(n_settings, dtype=np.int64)
+    counts = np.zeros((n_settings, len(horizons)), dtype=np.int64)
+    sums = np.zeros((n_settings, len(horizons)), dtype=np.float64)
+    hits = np.zeros((n_settings, len(horizons)), dtype=np.int64)
+    ticker_days = 0
+    baseline_counts = np.zeros(len(horizons), dtype=np.int64)
+    baseline_sums = np.zeros(len(horizons), dtype=np.float64)
+
+    for start in range(0, closes.shape[1], chunk_size):
+        block = closes[:, start:start + chunk_size]
+        returns = daily_returns(block)
+        streaks = down_streaks(block)
+        ticker_days += int(np.count_nonzero(~np.isnan(returns)))
+
+        forward_valid, forward_filled, forward_up = [], [], []
+        for j, h in enumerate(horizons):
+            forward = forward_returns(block, h)
+            valid = ~np.isnan(forward)
+            forward_valid.append(valid)
+            forward_filled.append(np.where(valid, forward, 0))
+            forward_up.append(forward > 0)
+            baseline_counts[j] += np.count_nonzero(valid)
+            baseline_sums[j] += forward_filled[j].sum(dtype=np.float64)
+
+        streak_masks = [streaks >= k for k in day_counts]
+        setting = 0
+        for threshold in thresholds:
+            drop = returns <= -threshold
+            drop_count = np.count_nonzero(drop)
+            for streak_mask in streak_masks:
+                alert = drop | streak_mask
+                alerts[setting] += np.count_nonzero(alert)
+                drop_alerts[setting] += drop_count
+                streak_alerts[setting] += np.count_nonzero(streak_mask)
+                for j in range(len(horizons)):
+                    scored = alert & forward_valid[j]
+                    counts[setting, j] += np.count_nonzero(scored)
+                    sums[setting, j] += forward_filled[j][scored].sum(dtype=np.float64)
+                    hits[setting, j] += np.count_nonzero(scored & forward_up[j])
+                setting += 1
+
+    rows = []
+    setting = 0
+    for threshold in thresholds:
+        for k in day_counts:
+            row = {
+                "daily_drop_threshold": threshold,
+                "consecutive_days": k,
+                "alerts": int(alerts[setting]),
+                "drop_alerts": int(drop_alerts[setting]),
+                "decline_alerts": int(streak_alerts[setting]),
+                "alerts_per_ticker_year": alerts[setting] / max(ticker_days, 1) * 252,
+            }
+            for j, h in enumerate(horizons):
+                n = counts[setting, j]
+                row[f"mean_fwd_{h}d_%"] = sums[setting, j] / n * 100 if n else np.nan
+                row[f"hit_rate_{h}d_%"] = hits[setting, j] / n * 100 if n else np.nan
+            rows.append(row)
+            setting += 1
+
+    baseline = {
+        f"mean_fwd_{h}d_%": baseline_sums[j] / max(baseline_counts[j], 1) * 100
+        for j, h in enumerate(horizons)
+    }
+    return pd.DataFrame(rows), baseline
+
+
+def parse_list(text: str, cast):
+    return [cast(x) for x in text.split(",") if x]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest stock monitor alert rules over historical closes")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--data", help="Directory of <TICKER>.csv files, a wide .csv/.parquet file, or an .npz cache")
+    source.add_argument("--synthetic", help="Random-walk universe as TICKERSxDAYS, e.g. 10000x2520")
+    parser.add_argument("--thresholds", type=lambda s: parse_list(s, float), default=DEFAULT_THRESHOLDS,
+                        help="Comma-separated daily drop thresholds (fractions)")
+    parser.add_argument("--days", type=lambda s: parse_list(s, int), default=DEFAULT_DAYS,
+                        help="Comma-separated consecutive decline day counts")
+    parser.add_argument("--horizons", type=lambda s: parse_list(s, int), default=DEFAULT_HORIZONS,
+                        help="Comma-separated forward-return horizons in sessions")
+    parser.add_argument("--save-npz", help="Write the loaded close matrix to this .npz for faster reloads")
+    parser.add_argument("--output", help="Write the sweep results to this CSV")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if args.synthetic:
+        n_tickers, n_days = (int(x) for x in args.synthetic.lower().split("x"))
+        dates, tickers, closes = synthetic_closes(n_tickers, n_days)
+    else:
+        dates, tickers, closes = load_close_matrix(args.data)
+    print(f"📂 Loaded {len(tickers)} tickers x {len(dates)} days in {time.perf_counter() - started:.1f}s")
+
+    if args.save_npz:
+        np.savez(args.save_npz, dates=dates, tickers=np.array(tickers), closes=closes)
+        print(f"💾 Close matrix saved to {args.save_npz}")
+
+    started = time.perf_counter()
+    results, baseline = sweep(closes, args.thresholds, args.days, args.horizons)
+    n_settings = len(args.thresholds) * len(args.days)
+    print(f"⚙️  Evaluated {n_settings} settings in {time.perf_counter() - started:.1f}s")
+
+    live = StockMonitor()
+    results["live"] = ((results["daily_drop_threshold"] == live.daily_drop_threshold) &
+                       (results["consecutive_days"] == live.consecutive_days))
+
+    print("\nUnconditional forward returns: " +
+          ", ".join(f"{k} {v:.3f}" for k, v in baseline.items()))
+    with pd.option_context("display.max_rows", None, "display.width", 200, "display.float_format", "{:.3f}".format):
+        print(results.to_string(index=False))
+
+    if args.output:
+        results.to_csv(args.output, index=False)
+        print(f"\n📄 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Sharded coordinator/worker mode for the stock monitor
+- The coordinator splits the ticker universe into shards with a consistent
+  hash ring and puts one task per shard on a SQLite-backed work queue
+- Workers (any number, on any host that can reach the queue file) claim a
+  shard, run the alert checks for its tickers and store the alerts
+- The coordinator waits for every shard, merges the alerts and sends a
+  single notification
+
+Usage:
+    python3 distributed_monitor.py --db /shared/monitor_queue.db coordinate --shards 16
+    python3 distributed_monitor.py --db /shared/monitor_queue.db work
+
+The queue is a plain SQLite file. For workers on several hosts put it on
+storage every host can write with working file locks (a local disk shared
+over NFS without lockd is not safe); otherwise run one coordinator per host.
+"""
+
+import argparse
+import bisect
+import hashlib
+import json
+import logging
+import os
+import socket
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from log_setup import setup_logging
+from price_store import alerts_from_rows, alerts_to_rows
+from stock_monitor import StockMonitor, TICKERS
+
+
+class HashRing:
+    """Consistent hash ring: adding or removing a shard only moves ~1/N of the tickers"""
+
+    def __init__(self, shards: List[str], vnodes: int = 64):
+        self.ring: List[Tuple[int, str]] = sorted(
+            (self._hash(f"{shard}#{i}"), shard) for shard in shards for i in range(vnodes)
+        )
+        self.keys = [k for k, _ in self.ring]
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], "big")
+
+    def shard_for(self, ticker: str) -> str:
+        """Shard owning a ticker (first ring point clockwise from its hash)"""
+        i = bisect.bisect(self.keys, self._hash(ticker)) % len(self.ring)
+        return self.ring[i][1]
+
+    def assign(self, tickers: List[str]) -> Dict[str, List[str]]:
+        """Group tickers by owning shard"""
+        shards: Dict[str, List[str]] = {}
+        for ticker in tickers:
+            shards.setdefault(self.shard_for(ticker), []).append(ticker)
+        return shards
+
+
+class WorkQueue:
+    """Shard tasks and results stored in one SQLite file"""
+
+    def __init__(self, db_path: str):
+        # isolation_level=None: we issue BEGIN IMMEDIATE ourselves when claiming
+        self.conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                run_id TEXT NOT NULL,
+                shard TEXT NOT NULL,
+                tickers TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                worker TEXT,
+                leased_at REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                alerts TEXT,
+                PRIMARY KEY (run_id, shard)
+            );
+            CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, leased_at);
+        """)
+
+    def enqueue(self, run_id: str, shards: Dict[str, List[str]]):
+        """Add one pending task per shard"""
+        self.conn.execute("BEGIN")
+        self.conn.executemany(
+            "INSERT INTO tasks (run_id, shard, tickers) VALUES (?, ?, ?)",
+            [(run_id, shard, json.dumps(tickers)) for shard, tickers in shards.items()],
+        )
+        self.conn.execute("COMMIT")
+
+    def claim(self, worker: str, lease_seconds: float,
+              max_attempts: int = 3) -> Optional[Tuple[str, str, List[str]]]:
+        """Atomically lease a pending task (or one whose lease expired), newest run first;
+        a task whose lease has expired max_attempts times is marked failed instead"""
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.execute(
+                "UPDATE tasks SET status = 'failed' WHERE status = 'leased' AND leased_at < ? AND attempts >= ?",
+                (now - lease_seconds, max_attempts),
+            )
+            row = self.conn.execute(
+                """SELECT run_id, shard, tickers FROM tasks
+                   WHERE status = 'pending' OR (status = 'leased' AND leased_at < ?)
+                   ORDER BY run_id DESC, shard LIMIT 1""",
+                (now - lease_seconds,),
+            ).fetchone()
+            if row:
+                self.conn.execute(
+                    """UPDATE tasks SET status = 'leased', worker = ?, leased_at = ?, attempts = attempts + 1
+                       WHERE run_id = ? AND shard = ?""",
+                    (worker, now, row[0], row[1]),
+                )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        if not row:
+            return None
+        return row[0], row[1], json.loads(row[2])
+
+    def complete(self, run_id: str, shard: str, worker: str, alerts_data: Dict):
+        """Store a shard's alerts; ignored if the lease was taken over by another worker"""
+        self.conn.execute(
+            "UPDATE tasks SET status = 'done', alerts = ? WHERE run_id = ? AND shard = ? AND worker = ?",
+            (json.dumps(alerts_to_rows(alerts_data)), run_id, shard, worker),
+        )
+
+    def remaining(self, run_id: str) -> int:
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM tasks WHERE run_id = ? AND status IN ('pending', 'leased')", (run_id,)
+        ).fetchone()[0]
+
+    def failed(self, run_id: str) -> List[str]:
+        rows = self.conn.execute(
+            "SELECT shard FROM tasks WHERE run_id = ? AND status = 'failed' ORDER BY shard", (run_id,)
+        ).fetchall()
+        return [shard for (shard,) in rows]
+
+    def abandon(self, run_id: str) -> int:
+        """Stop handing out a run's unfinished tasks (the coordinator gave up on it)"""
+        return self.conn.execute(
+            "UPDATE tasks SET status = 'abandoned' WHERE run_id = ? AND status IN ('pending', 'leased')", (run_id,)
+        ).rowcount
+
+    def purge(self, before_run_id: str) -> int:
+        """Delete every task of runs older than before_run_id (run ids sort by start time)"""
+        return self.conn.execute("DELETE FROM tasks WHERE run_id < ?", (before_run_id,)).rowcount
+
+    def results(self, run_id: str) -> List[Dict]:
+        rows = self.conn.execute(
+            "SELECT alerts FROM tasks WHERE run_id = ? AND status = 'done'", (run_id,)
+        ).fetchall()
+        return [alerts_from_rows(json.loads(alerts)) for (alerts,) in rows]
+
+
+def merge_alerts(results: List[Dict]) -> Dict:
+    """Combine per-shard alerts into one alerts_data dict, ordered by ticker"""
+    merged = {'daily_drops': [], 'consecutive_declines': []}
+    for alerts_data in results:
+        for key in merged:
+            merged[key].extend(alerts_data[key])
+    for key in merged:
+        merged[key].sort(key=lambda alert: alert.ticker)
+    return merged
+
+
+def coordinate(args):
+    """Shard the universe, wait for the workers and send one notification"""
+    monitor = StockMonitor()
+    if not monitor.is_market_day():
+        logging.info("Market closed today (weekend or exchange holiday), skipping monitoring")
+        return
+
+    tickers = TICKERS
+    if args.tickers_file:
+        with open(args.tickers_file) as f:
+            tickers = [line.strip() for line in f if line.strip()]
+
+    ring = HashRing([f"shard-{i:03d}" for i in range(args.shards)])
+    shards = ring.assign(tickers)
+    # Microseconds keep run ids unique when two coordinators start in the same second
+    run_id = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    queue = WorkQueue(args.db)
+    purged = queue.purge((datetime.now() - timedelta(days=args.keep_days)).strftime("%Y%m%d-%H%M%S-%f"))
+    if purged:
+        logging.info(f"Removed {purged} tasks from runs older than {args.keep_days} days")
+    queue.enqueue(run_id, shards)
+    logging.info(f"🔍 Run {run_id}: {len(tickers)} stocks in {len(shards)} shards queued")
+
+    deadline = time.time() + args.timeout
+    while (remaining := queue.remaining(run_id)) and time.time() < deadline:
+        time.sleep(args.poll_interval)
+    if remaining:
+        # Abandon the rest so workers do not spend the next run finishing this one
+        queue.abandon(run_id)
+        logging.error(f"Run {run_id}: {remaining} shards not finished after {args.timeout}s - sending partial results")
+    failed = queue.failed(run_id)
+    if failed:
+        logging.error(f"Run {run_id}: {len(failed)} shards failed after repeated worker deaths: {', '.join(failed)}")
+
+    monitor.notify(merge_alerts(queue.results(run_id)))
+    logging.info(f"Run {run_id} completed")
+
+
+def work(args):
+    """Claim shards and evaluate them until stopped (or the queue is empty with --once)"""
+    monitor = StockMonitor()
+    monitor.request_delay = args.delay
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    queue = WorkQueue(args.db)
+    logging.info(f"👷 Worker {worker} started")
+
+    while True:
+        task = queue.claim(worker, args.lease, args.max_attempts)
+        if task is None:
+            if args.once:
+                break
+            time.sleep(args.poll_interval)
+            continue
+
+        run_id, shard, tickers = task
+        logging.info(f"Run {run_id}: evaluating {shard} ({len(tickers)} stocks)")
+        queue.complete(run_id, shard, worker, monitor.evaluate_tickers(tickers))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sharded coordinator/worker mode for the stock monitor")
+    parser.add_argument("--db", default="monitor_queue.db", help="SQLite work queue file shared by all processes")
+    parser.add_argument("--poll-interval", type=float, default=5, help="Seconds between queue polls")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    coordinator = commands.add_parser("coordinate", help="Queue a monitoring run and send the merged alerts")
+    coordinator.add_argument("--shards", type=int, default=8)
+    coordinator.add_argument("--tickers-file", help="One ticker per line (defaults to TICKERS)")
+    coordinator.add_argument("--timeout", type=float, default=3600, help="Seconds to wait for all shards")
+    coordinator.add_argument("--keep-days", type=float, default=7, help="Delete queue entries of older runs")
+    coordinator.set_defaults(func=coordinate)
+
+    worker = commands.add_parser("work", help="Evaluate queued shards")
+    worker.add_argument("--lease", type=float, default=900, help="Seconds before an unfinished shard is re-queued")
+    worker.add_argument("--max-attempts", type=int, default=3,
+                        help="Leases a shard may expire before it is marked failed")
+    worker.add_argument("--delay", type=float, default=0.5, help="Seconds between batch downloads")
+    worker.add_argument("--once", action="store_true", help="Exit when the queue is empty")
+    worker.set_defaults(func=work)
+
+    args = parser.parse_args()
+    setup_logging('stock_monitor.log', debug_sample_rate=float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "0")))
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
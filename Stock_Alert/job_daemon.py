@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Single daemon for the stock monitor and the daily news digest
+- stock_monitor: StockMonitor.run_monitoring_cycle at 5:30 PM on trading days
+- stock_news: stocknews.run_all_jobs (Python/stocknews.py) at 9:00 AM on trading days
+
+Both jobs share one JobScheduler: it sleeps until the next deadline, runs the
+two jobs concurrently if they overlap, never starts a job that is still
+running, and catches up a run missed while the daemon was down.
+
+Usage:
+    python3 job_daemon.py
+    NEWS_TIME=08:30 STOCKNEWS_DIR=/path/to/Python python3 job_daemon.py
+"""
+
+import os
+import sys
+
+from job_scheduler import JobScheduler
+from log_setup import setup_logging
+from market_calendar import nyse_calendar
+from stock_monitor import StockMonitor, setup_scheduler
+
+STOCKNEWS_DIR = os.getenv("STOCKNEWS_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Python"))
+NEWS_TIME = os.getenv("NEWS_TIME", "09:00")
+JOB_STATE_FILE = os.getenv("JOB_STATE_FILE", "job_state.json")
+
+
+def run_news_digest():
+    """Send the daily news digest emails"""
+    if STOCKNEWS_DIR not in sys.path:
+        sys.path.insert(0, STOCKNEWS_DIR)
+    import stocknews
+
+    stocknews.check_environment()
+    stocknews.run_all_jobs()
+
+
+def main():
+    setup_logging('stock_monitor.log', debug_sample_rate=float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "0")))
+
+    scheduler = JobScheduler(state_file=JOB_STATE_FILE)
+    setup_scheduler(StockMonitor(), scheduler)
+    # Jitter keeps the NewsAPI/Gemini calls from landing on the exact minute every day
+    scheduler.add_job("stock_news", run_news_digest, at=NEWS_TIME, run_on=nyse_calendar.is_session,
+                      jitter_seconds=60)
+
+    print("✅ Job daemon started! Press Ctrl+C to stop.")
+    scheduler.run_forever()
+    print("\n👋 Job daemon stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Deadline-driven job scheduler
+- Sleeps until the next job is due instead of polling every minute
+- Runs independent jobs concurrently on a thread pool; a job that is still
+  running when it comes due again is skipped rather than overlapped
+- Optional per-job jitter spreads out starts
+- Last run times are persisted to a JSON state file, so a run missed while
+  the daemon was down is caught up once on the next start
+"""
+
+import json
+import logging
+import os
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta
+from typing import Callable, Dict, List, Optional
+
+# Wake at least this often so wall-clock jumps (sleep/suspend, DST) are noticed
+MAX_SLEEP_SECONDS = 300
+
+
+class Job:
+    def __init__(self, name: str, func: Callable, at: str, run_on: Callable[[date], bool],
+                 jitter_seconds: float = 0):
+        self.name = name
+        self.func = func
+        self.at = time.fromisoformat(at)
+        self.run_on = run_on
+        self.jitter_seconds = jitter_seconds
+        self.lock = threading.Lock()  # held while the job runs
+        self.scheduled: Optional[datetime] = None  # next scheduled time
+        self.next_run: Optional[datetime] = None   # scheduled time plus jitter
+
+    def scheduled_after(self, moment: datetime) -> datetime:
+        """First scheduled time strictly after `moment` (without jitter)"""
+        day = moment.date()
+        for _ in range(366):
+            candidate = datetime.combine(day, self.at)
+            if candidate > moment and self.run_on(day):
+                return candidate
+            day += timedelta(days=1)
+        raise ValueError(f"{self.name} has no run day in the year after {moment:%Y-%m-%d}")
+
+
+class JobScheduler:
+    def __init__(self, state_file: str = "job_state.json", catchup_window: timedelta = timedelta(hours=6)):
+        self.jobs: List[Job] = []
+        self.state_file = state_file
+        self.catchup_window = catchup_window
+        self.state: Dict[str, Dict] = self._load_state()
+        self.state_lock = threading.Lock()
+        self.stop_event = threading.Event()
+
+    def add_job(self, name: str, func: Callable, at: str, run_on: Callable[[date], bool] = lambda day: True,
+                jitter_seconds: float = 0):
+        """Run func daily at HH:MM local time on days where run_on(day) is true"""
+        self.jobs.append(Job(name, func, at, run_on, jitter_seconds))
+
+    def _load_state(self) -> Dict[str, Dict]:
+        if os.path.exists(self.state_file):
+            with open(self.state_file) as f:
+                return json.load(f)
+        return {}
+
+    def _save_state(self):
+        tmp_file = f"{self.state_file}.tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_file, self.state_file)  # atomic, so a crash never leaves half a file
+
+    def _schedule_next(self, job: Job, after: datetime):
+        job.scheduled = job.scheduled_after(after)
+        job.next_run = job.scheduled + timedelta(seconds=random.uniform(0, job.jitter_seconds))
+
+    def _missed_run(self, job: Job, now: datetime) -> Optional[datetime]:
+        """Most recent scheduled time since the last recorded run, if it is within the catch-up window"""
+        last_run = self.state.get(job.name, {}).get("last_scheduled")
+        if last_run is None:
+            return None
+        missed = None
+        scheduled = job.scheduled_after(datetime.fromisoformat(last_run))
+        while scheduled <= now:
+            missed = scheduled
+            scheduled = job.scheduled_after(scheduled)
+        if missed and now - missed <= self.catchup_window:
+            return missed
+        return None
+
+    def _run(self, job: Job, scheduled: datetime):
+        started = datetime.now()
+        status = "ok"
+        try:
+            logging.info(f"▶️ {job.name} started (scheduled {scheduled:%Y-%m-%d %H:%M:%S})")
+            job.func()
+        except Exception as e:
+            status = f"error: {e}"
+            logging.exception(f"{job.name} failed")
+        finally:
+            job.lock.release()
+            with self.state_lock:
+                self.state[job.name] = {
+                    "last_scheduled": scheduled.isoformat(),
+                    "last_started": started.isoformat(timespec="seconds"),
+                    "last_finished": datetime.now().isoformat(timespec="seconds"),
+                    "last_status": status,
+                }
+                self._save_state()
+            logging.info(f"⏹️ {job.name} finished in {(datetime.now() - started).total_seconds():.1f}s ({status})")
+
+    def _dispatch(self, executor: ThreadPoolExecutor, job: Job, scheduled: datetime):
+        if not job.lock.acquire(blocking=False):
+            logging.warning(f"{job.name} is still running, skipping the {scheduled:%H:%M} run")
+            return
+        executor.submit(self._run, job, scheduled)
+
+    def run_forever(self):
+        """Run jobs until stop() is called or Ctrl+C"""
+        if not self.jobs:
+            return
+        now = datetime.now()
+        with ThreadPoolExecutor(max_workers=max(len(self.jobs), 1), thread_name_prefix="job") as executor:
+            for job in self.jobs:
+                missed = self._missed_run(job, now)
+                if missed:
+                    logging.info(f"⏪ {job.name} missed its {missed:%Y-%m-%d %H:%M} run, catching up")
+                    self._dispatch(executor, job, missed)
+                self._schedule_next(job, now)
+                logging.info(f"📅 {job.name} next run at {job.next_run:%Y-%m-%d %H:%M:%S}")
+
+            try:
+                while not self.stop_event.is_set():
+                    job = min(self.jobs, key=lambda j: j.next_run)
+                    wait = (job.next_run - datetime.now()).total_seconds()
+                    if wait > 0:
+                        self.stop_event.wait(min(wait, MAX_SLEEP_SECONDS))
+                        continue
+                    self._dispatch(executor, job, job.scheduled)
+                    self._schedule_next(job, job.scheduled)
+                    logging.info(f"📅 {job.name} next run at {job.next_run:%Y-%m-%d %H:%M:%S}")
+            except KeyboardInterrupt:
+                logging.info("Scheduler interrupted, waiting for running jobs to finish")
+                self.stop_event.set()
+
+    def stop(self):
+        self.stop_event.set()
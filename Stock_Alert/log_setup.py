@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Logging setup for the stock monitor
+- Callers only put records on an in-memory queue (QueueHandler); a background
+  QueueListener thread does the console and file I/O, so the per-ticker loop
+  never waits on disk
+- The log file gets one JSON object per line, including the optional
+  ticker / stage / latency_ms fields passed with `extra=`
+- The file rotates daily or when it reaches max_bytes, whichever comes first,
+  and rotated files are gzip-compressed
+- Per-ticker DEBUG events are sampled: only a stable subset of tickers is
+  traced, so debug logging stays cheap on large universes. Only the
+  monitor's own TRACE_LOGGER is raised to DEBUG; the root logger (and with it
+  yfinance, urllib3, peewee, ...) stays at INFO
+"""
+
+import atexit
+import gzip
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import time
+import zlib
+from datetime import datetime, timedelta
+
+# Fields callers may attach with logging.info(..., extra={...})
+EVENT_FIELDS = ("ticker", "stage", "latency_ms")
+
+# Logger for the sampled per-ticker DEBUG events
+TRACE_LOGGER = "stock_monitor"
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        event = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+        for field in EVENT_FIELDS:
+            if hasattr(record, field):
+                event[field] = getattr(record, field)
+        # Tracebacks are already part of the message: QueueHandler.prepare() merges them
+        return json.dumps(event, ensure_ascii=False)
+
+
+class TickerSampler(logging.Filter):
+    """Drop DEBUG records for tickers outside the sample; everything else passes"""
+
+    def __init__(self, sample_rate: float):
+        super().__init__()
+        self.cutoff = int(sample_rate * 10000)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        ticker = getattr(record, "ticker", None)
+        if record.levelno > logging.DEBUG or ticker is None:
+            return True
+        # crc32 keeps the same tickers sampled on every cycle and every host
+        return zlib.crc32(ticker.encode()) % 10000 < self.cutoff
+
+
+def _gzip_rotator(source: str, dest: str):
+    with open(source, "rb") as f_in, gzip.open(dest, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+class RotatingCompressedFileHandler(logging.handlers.RotatingFileHandler):
+    """Size-based rotation that also rolls over at midnight; backups are .gz"""
+
+    def __init__(self, filename: str, max_bytes: int, backup_count: int):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+        self.rotator = _gzip_rotator
+        self.namer = lambda name: name + ".gz"
+        self.next_rollover = self._next_midnight()
+
+    @staticmethod
+    def _next_midnight() -> float:
+        tomorrow = datetime.now().date() + timedelta(days=1)
+        return datetime.combine(tomorrow, datetime.min.time()).timestamp()
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if time.time() >= self.next_rollover:
+            return True
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        super().doRollover()
+        self.next_rollover = self._next_midnight()
+
+
+def setup_logging(log_file: str = "stock_monitor.log", debug_sample_rate: float = 0.0,
+                  max_bytes: int = 10 * 1024 * 1024, backup_count: int = 14):
+    """Route all logging through a queue to console and a rotating JSON file"""
+    console = logging.StreamHandler()
+    console.setLevel(logging.INFO)
+    console.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+
+    log_dir = os.path.dirname(log_file)
+    if log_dir:
+        os.makedirs(log_dir, exist_ok=True)
+    file_handler = RotatingCompressedFileHandler(log_file, max_bytes, backup_count)
+    file_handler.setFormatter(JsonFormatter())
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    # Sample on the producer side so unsampled tickers never reach the queue
+    queue_handler.addFilter(TickerSampler(debug_sample_rate))
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(logging.INFO)
+    logging.getLogger(TRACE_LOGGER).setLevel(logging.DEBUG if debug_sample_rate > 0 else logging.NOTSET)
+
+    listener = logging.handlers.QueueListener(log_queue, console, file_handler, respect_handler_level=True)
+    listener.start()
+    # Flush whatever is still queued when the process exits
+    atexit.register(listener.stop)
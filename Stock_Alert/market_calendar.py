@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+NYSE trading-session calendar
+- Full-day holidays and early closes (1:00 PM ET) from the exchange rules
+- Sessions are precomputed once into a sorted list plus a date -> index map,
+  so "is this a session?" and "N sessions back" are O(1) lookups
+"""
+
+from datetime import date, time, timedelta
+from typing import Dict, List, Optional, Set
+
+REGULAR_CLOSE = time(16, 0)
+EARLY_CLOSE = time(13, 0)
+
+# Years covered by the precomputed calendar
+FIRST_YEAR = 2000
+LAST_YEAR = 2035
+
+# Unscheduled closures that don't follow the holiday rules
+SPECIAL_CLOSURES = {
+    date(2001, 9, 11), date(2001, 9, 12), date(2001, 9, 13), date(2001, 9, 14),  # September 11
+    date(2004, 6, 11),   # President Reagan's funeral
+    date(2007, 1, 2),    # President Ford's funeral
+    date(2012, 10, 29), date(2012, 10, 30),  # Hurricane Sandy
+    date(2018, 12, 5),   # President George H.W. Bush's funeral
+    date(2025, 1, 9),    # President Carter's funeral
+}
+
+
+def _easter(year: int) -> date:
+    """Gregorian Easter Sunday (anonymous Gregorian algorithm)"""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """n-th given weekday of a month (n=-1 for the last one)"""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    next_month = date(year + month // 12, month % 12 + 1, 1)
+    last = next_month - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _observed(holiday: date) -> date:
+    """Saturday holidays are observed Friday, Sunday holidays Monday"""
+    if holiday.weekday() == 5:
+        return holiday - timedelta(days=1)
+    if holiday.weekday() == 6:
+        return holiday + timedelta(days=1)
+    return holiday
+
+
+def nyse_holidays(year: int) -> Set[date]:
+    """Full-day NYSE closures for a year"""
+    holidays = {
+        _nth_weekday(year, 1, 0, 3),        # Martin Luther King Jr. Day
+        _nth_weekday(year, 2, 0, 3),        # Washington's Birthday
+        _easter(year) - timedelta(days=2),  # Good Friday
+        _nth_weekday(year, 5, 0, -1),       # Memorial Day
+        _observed(date(year, 7, 4)),        # Independence Day
+        _nth_weekday(year, 9, 0, 1),        # Labor Day
+        _nth_weekday(year, 11, 3, 4),       # Thanksgiving
+        _observed(date(year, 12, 25)),      # Christmas
+    }
+    # New Year's Day falling on Saturday is not observed on the prior Friday
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:
+        holidays.add(_observed(new_year))
+    if year >= 2022:
+        holidays.add(_observed(date(year, 6, 19)))  # Juneteenth
+    return holidays
+
+
+def nyse_early_closes(year: int, holidays: Set[date]) -> Set[date]:
+    """Sessions that close at 1:00 PM ET"""
+    candidates = [
+        date(year, 7, 3),                                     # Day before Independence Day
+        _nth_weekday(year, 11, 3, 4) + timedelta(days=1),     # Day after Thanksgiving
+        date(year, 12, 24),                                   # Christmas Eve
+    ]
+    return {d for d in candidates if d.weekday() < 5 and d not in holidays}
+
+
+class TradingCalendar:
+    def __init__(self, first_year: int = FIRST_YEAR, last_year: int = LAST_YEAR):
+        self.holidays: Set[date] = set()
+        self.early_closes: Set[date] = set()
+        for year in range(first_year, last_year + 1):
+            year_holidays = nyse_holidays(year)
+            self.holidays |= year_holidays
+            self.early_closes |= nyse_early_closes(year, year_holidays)
+        self.holidays |= SPECIAL_CLOSURES
+
+        self.sessions: List[date] = []
+        day = date(first_year, 1, 1)
+        while day.year <= last_year:
+            if day.weekday() < 5 and day not in self.holidays:
+                self.sessions.append(day)
+            day += timedelta(days=1)
+        self.session_index: Dict[date, int] = {d: i for i, d in enumerate(self.sessions)}
+
+    def is_session(self, day: date) -> bool:
+        """Check if the exchange is open on this date"""
+        return day in self.session_index
+
+    def close_time(self, day: date) -> Optional[time]:
+        """Closing time (ET) for a session, None if the exchange is closed"""
+        if not self.is_session(day):
+            return None
+        return EARLY_CLOSE if day in self.early_closes else REGULAR_CLOSE
+
+    def previous_session(self, day: date) -> date:
+        """Most recent session on or before this date"""
+        if day < self.sessions[0] or day.year > self.sessions[-1].year:
+            raise ValueError(f"{day} is outside the calendar range {self.sessions[0]} - {self.sessions[-1]}")
+        while day not in self.session_index:
+            day -= timedelta(days=1)
+        return day
+
+    def sessions_back(self, day: date, n: int) -> List[date]:
+        """The last n sessions ending on (and including) the session on/before day"""
+        end = self.session_index[self.previous_session(day)]
+        return self.sessions[max(0, end - n + 1):end + 1]
+
+
+# Shared instance - building it takes a few milliseconds
+nyse_calendar = TradingCalendar()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Compact price and alert representations
+- PriceMatrix: one contiguous (sessions x tickers) close-price array plus an
+  interned ticker -> column index; only the Close column is kept, no
+  OHLCV/dividend/split frames per ticker
+- DailyDropAlert / ConsecutiveDeclineAlert: __slots__ dataclasses instead of
+  per-alert dicts, serialized as plain tuples
+"""
+
+import sys
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, List
+
+# numpy is imported inside the PriceMatrix methods so that importing the alert
+# types (stock_monitor does at startup) stays cheap
+
+
+class PriceMatrix:
+    def __init__(self, dates, tickers: List[str], closes):
+        import numpy as np
+        self.dates = dates
+        self.tickers = [sys.intern(t) for t in tickers]
+        self.index: Dict[str, int] = {t: i for i, t in enumerate(self.tickers)}
+        self.closes = np.ascontiguousarray(closes)
+
+    @classmethod
+    def from_yfinance(cls, tickers: List[str], start: date, end: date, dtype="float64") -> "PriceMatrix":
+        """Download closes for many tickers in one request (end date inclusive)"""
+        import yfinance as yf
+        data = yf.download(tickers, start=start, end=end + timedelta(days=1), auto_adjust=True,
+                           actions=False, progress=False, threads=True)
+        close = data["Close"]
+        if close.ndim == 1:  # older yfinance returns flat columns for a single ticker
+            close = close.to_frame(tickers[0])
+        close = close.reindex(columns=tickers)
+        return cls(close.index.to_numpy(dtype="datetime64[D]"), tickers, close.to_numpy(dtype=dtype))
+
+    def column(self, ticker: str):
+        """Closes for one ticker, oldest first, with missing sessions dropped"""
+        import numpy as np
+        closes = self.closes[:, self.index[ticker]]
+        return closes[~np.isnan(closes)]
+
+    @property
+    def nbytes(self) -> int:
+        return self.closes.nbytes + self.dates.nbytes
+
+
+@dataclass
+class DailyDropAlert:
+    __slots__ = ('ticker', 'change_percent', 'current_price', 'previous_close')
+    ticker: str
+    change_percent: float
+    current_price: float
+    previous_close: float
+
+
+@dataclass
+class ConsecutiveDeclineAlert:
+    __slots__ = ('ticker', 'consecutive_days', 'current_price', 'start_price', 'total_decline')
+    ticker: str
+    consecutive_days: int
+    current_price: float
+    start_price: float
+    total_decline: float
+
+
+ALERT_TYPES = {
+    'daily_drops': DailyDropAlert,
+    'consecutive_declines': ConsecutiveDeclineAlert,
+}
+
+
+def alerts_to_rows(alerts_data: Dict) -> Dict[str, List[tuple]]:
+    """alerts_data -> JSON-friendly {kind: [tuple, ...]}"""
+    return {
+        kind: [tuple(getattr(alert, field) for field in alert.__slots__) for alert in alerts]
+        for kind, alerts in alerts_data.items()
+    }
+
+
+def alerts_from_rows(rows: Dict[str, List]) -> Dict:
+    """Inverse of alerts_to_rows"""
+    return {kind: [ALERT_TYPES[kind](*row) for row in alerts] for kind, alerts in rows.items()}
@@ -7,27 +7,28 @@ Free Stock Monitoring & Notification System
 - Monitors 44 stocks for daily drops >5% and 3-day consecutive declines
 """
 
-import yfinance as yf
-import pandas as pd
 from datetime import datetime, timedelta
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-import schedule
 import time
 import os
 import logging
+import sys
 from typing import Dict, List, Optional
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('stock_monitor.log'),
-        logging.StreamHandler()
-    ]
-)
+from job_scheduler import JobScheduler
+from log_setup import TRACE_LOGGER, setup_logging
+from market_calendar import nyse_calendar
+from price_store import ConsecutiveDeclineAlert, DailyDropAlert, PriceMatrix
+
+# yfinance (which pulls in pandas) is imported inside the functions that
+# use it, so cron starts only pay for it when needed.
+
+# Logging is configured by setup_logging() in main(); set LOG_DEBUG_SAMPLE_RATE
+# (e.g. 0.05) to trace per-ticker fetch/evaluate events for a sample of tickers.
+# Those DEBUG events go through trace_log so other libraries stay at INFO.
+trace_log = logging.getLogger(TRACE_LOGGER)
 
 # Your 44 stock tickers
 TICKERS = [
@@ -51,64 +52,67 @@ class StockMonitor:
         # Thresholds
         self.daily_drop_threshold = 0.05  # 5%
         self.consecutive_days = 3
+
+        # Tickers per Yahoo Finance download, and the pause between downloads
+        self.batch_size = 200
+        self.request_delay = 0.5  # seconds
         
     def is_market_day(self) -> bool:
-        """Check if today is a market day (Monday-Friday, basic check)"""
-        today = datetime.now()
-        return today.weekday() < 5  # 0-4 are Mon-Fri
+        """Check if today is an exchange session (weekends and NYSE holidays excluded)"""
+        return nyse_calendar.is_session(datetime.now().date())
+
+    def fetch_closes(self, tickers: List[str], sessions: int) -> PriceMatrix:
+        """Download exactly the last `sessions` trading sessions of closes for a batch of tickers"""
+        window = nyse_calendar.sessions_back(datetime.now().date(), sessions)
+        started = time.perf_counter()
+        prices = PriceMatrix.from_yfinance(tickers, window[0], window[-1])
+        trace_log.debug(f"Fetched {len(tickers)} tickers x {sessions} sessions", extra={
+            'stage': 'fetch', 'latency_ms': round((time.perf_counter() - started) * 1000, 1)
+        })
+        return prices
     
-    def check_daily_drop(self, ticker: str) -> Optional[Dict]:
-        """Check if stock dropped more than threshold today"""
+    def check_daily_drop(self, ticker: str, closes) -> Optional[DailyDropAlert]:
+        """Check if stock dropped more than threshold today (closes: oldest first)"""
         try:
-            stock = yf.Ticker(ticker)
-            # Get 5 days to ensure we have at least 2 trading days
-            hist = stock.history(period="5d")
-            
-            if len(hist) >= 2:
-                current_price = hist['Close'].iloc[-1]
-                previous_close = hist['Close'].iloc[-2]
+            if len(closes) >= 2:
+                current_price = float(closes[-1])
+                previous_close = float(closes[-2])
                 daily_change = (current_price - previous_close) / previous_close
                 
                 if daily_change <= -self.daily_drop_threshold:
-                    logging.info(f"📉 {ticker}: {daily_change*100:.2f}% drop detected")
-                    return {
-                        'ticker': ticker,
-                        'change_percent': daily_change * 100,
-                        'current_price': current_price,
-                        'previous_close': previous_close
-                    }
+                    logging.info(f"📉 {ticker}: {daily_change*100:.2f}% drop detected",
+                                 extra={'ticker': ticker, 'stage': 'daily_drop'})
+                    return DailyDropAlert(ticker, daily_change * 100, current_price, previous_close)
         except Exception as e:
-            logging.error(f"Error checking daily drop for {ticker}: {e}")
+            logging.error(f"Error checking daily drop for {ticker}: {e}",
+                          extra={'ticker': ticker, 'stage': 'daily_drop'})
         return None
 
-    def check_consecutive_decline(self, ticker: str) -> Optional[Dict]:
-        """Check if stock declined for consecutive days"""
+    def check_consecutive_decline(self, ticker: str, closes) -> Optional[ConsecutiveDeclineAlert]:
+        """Check if stock declined for consecutive days (closes: oldest first)"""
         try:
-            stock = yf.Ticker(ticker)
-            # Get 10 days to ensure we have enough trading days
-            hist = stock.history(period="10d")
-            
-            if len(hist) >= self.consecutive_days + 1:
+            if len(closes) >= self.consecutive_days + 1:
                 consecutive_down = 0
                 
                 # Check from most recent day backwards
-                for i in range(len(hist) - 1, 0, -1):
-                    if hist['Close'].iloc[i] < hist['Close'].iloc[i-1]:
+                for i in range(len(closes) - 1, 0, -1):
+                    if closes[i] < closes[i-1]:
                         consecutive_down += 1
                     else:
                         break
                         
                 if consecutive_down >= self.consecutive_days:
-                    logging.info(f"📊 {ticker}: {consecutive_down} consecutive down days")
-                    return {
-                        'ticker': ticker,
-                        'consecutive_days': consecutive_down,
-                        'current_price': hist['Close'].iloc[-1],
-                        'start_price': hist['Close'].iloc[-(consecutive_down+1)],
-                        'total_decline': ((hist['Close'].iloc[-1] - hist['Close'].iloc[-(consecutive_down+1)]) / hist['Close'].iloc[-(consecutive_down+1)]) * 100
-                    }
+                    logging.info(f"📊 {ticker}: {consecutive_down} consecutive down days",
+                                 extra={'ticker': ticker, 'stage': 'consecutive_decline'})
+                    current_price = float(closes[-1])
+                    start_price = float(closes[-(consecutive_down+1)])
+                    return ConsecutiveDeclineAlert(
+                        ticker, consecutive_down, current_price, start_price,
+                        (current_price - start_price) / start_price * 100
+                    )
         except Exception as e:
-            logging.error(f"Error checking consecutive decline for {ticker}: {e}")
+            logging.error(f"Error checking consecutive decline for {ticker}: {e}",
+                          extra={'ticker': ticker, 'stage': 'consecutive_decline'})
         return None
     def create_email_content(self, alerts_data: Dict) -> str:
         """Create HTML email content"""
@@ -143,13 +147,13 @@ class StockMonitor:
             """
             
             for alert in alerts_data['daily_drops']:
-                chart_link = f"https://finance.yahoo.com/quote/{alert['ticker']}"
+                chart_link = f"https://finance.yahoo.com/quote/{alert.ticker}"
                 html_content += f"""
                 <tr>
-                    <td class="ticker">{alert['ticker']}</td>
-                    <td class="negative">{alert['change_percent']:.2f}%</td>
-                    <td>${alert['current_price']:.2f}</td>
-                    <td>${alert['previous_close']:.2f}</td>
+                    <td class="ticker">{alert.ticker}</td>
+                    <td class="negative">{alert.change_percent:.2f}%</td>
+                    <td>${alert.current_price:.2f}</td>
+                    <td>${alert.previous_close:.2f}</td>
                     <td><a href="{chart_link}" target="_blank">View Chart</a></td>
                 </tr>
                 """
@@ -170,13 +174,13 @@ class StockMonitor:
             """
             
             for alert in alerts_data['consecutive_declines']:
-                chart_link = f"https://finance.yahoo.com/quote/{alert['ticker']}"
+                chart_link = f"https://finance.yahoo.com/quote/{alert.ticker}"
                 html_content += f"""
                 <tr>
-                    <td class="ticker">{alert['ticker']}</td>
-                    <td>{alert['consecutive_days']}</td>
-                    <td>${alert['current_price']:.2f}</td>
-                    <td class="negative">{alert['total_decline']:.2f}%</td>
+                    <td class="ticker">{alert.ticker}</td>
+                    <td>{alert.consecutive_days}</td>
+                    <td>${alert.current_price:.2f}</td>
+                    <td class="negative">{alert.total_decline:.2f}%</td>
                     <td><a href="{chart_link}" target="_blank">View Chart</a></td>
                 </tr>
                 """
@@ -225,55 +229,100 @@ class StockMonitor:
         except Exception as e:
             logging.error(f"Error sending email: {e}")
             return False
-    def run_monitoring_cycle(self):
-        """Main monitoring function"""
-        if not self.is_market_day():
-            logging.info("Weekend detected, skipping monitoring")
-            return
-        
-        logging.info(f"🔍 Starting stock monitoring cycle for {len(TICKERS)} stocks")
-        
+    def evaluate_tickers(self, tickers: List[str]) -> Dict:
+        """Run both alert checks over a list of tickers and collect the alerts"""
         alerts_data = {
             'daily_drops': [],
             'consecutive_declines': []
         }
         
-        # Check each ticker
-        for i, ticker in enumerate(TICKERS):
-            logging.info(f"Checking {ticker} ({i+1}/{len(TICKERS)})")
-            
-            # Check for daily drops
-            drop_alert = self.check_daily_drop(ticker)
-            if drop_alert:
-                alerts_data['daily_drops'].append(drop_alert)
+        # Enough sessions for both rules: N down days need N+1 closes
+        lookback = max(2, self.consecutive_days + 1)
+        
+        for start in range(0, len(tickers), self.batch_size):
+            batch = tickers[start:start + self.batch_size]
+            try:
+                prices = self.fetch_closes(batch, lookback)
+            except Exception as e:
+                logging.error(f"Error downloading prices for {len(batch)} tickers ({batch[0]}...): {e}",
+                              extra={'stage': 'fetch'})
+                continue
             
-            # Check for consecutive declines
-            decline_alert = self.check_consecutive_decline(ticker)
-            if decline_alert:
-                alerts_data['consecutive_declines'].append(decline_alert)
+            # Check each ticker
+            for ticker in batch:
+                started = time.perf_counter()
+                closes = prices.column(ticker)
+                if len(closes) == 0:
+                    # Yahoo returns an all-NaN column for delisted or unknown tickers
+                    logging.warning(f"No price data returned for {ticker}", extra={'ticker': ticker, 'stage': 'fetch'})
+                    continue
+                
+                # Check for daily drops
+                drop_alert = self.check_daily_drop(ticker, closes)
+                if drop_alert:
+                    alerts_data['daily_drops'].append(drop_alert)
+                
+                # Check for consecutive declines
+                decline_alert = self.check_consecutive_decline(ticker, closes)
+                if decline_alert:
+                    alerts_data['consecutive_declines'].append(decline_alert)
+                
+                trace_log.debug(f"Checked {ticker}", extra={
+                    'ticker': ticker, 'stage': 'evaluate', 'latency_ms': round((time.perf_counter() - started) * 1000, 3)
+                })
             
             # Rate limiting to be nice to Yahoo Finance
-            time.sleep(0.5)  # Wait 0.5 seconds between requests
+            if start + self.batch_size < len(tickers):
+                time.sleep(self.request_delay)
         
-        # Send alerts if any found
+        return alerts_data
+
+    def notify(self, alerts_data: Dict):
+        """Send one notification for all alerts found in a cycle"""
         total_alerts = len(alerts_data['daily_drops']) + len(alerts_data['consecutive_declines'])
         if total_alerts > 0:
             logging.info(f"🚨 {total_alerts} alerts triggered - sending notification")
             self.send_email_alert(alerts_data)
         else:
             logging.info("✅ No alerts triggered")
+
+    def run_monitoring_cycle(self):
+        """Main monitoring function"""
+        if not self.is_market_day():
+            logging.info("Market closed today (weekend or exchange holiday), skipping monitoring")
+            return
+        
+        logging.info(f"🔍 Starting stock monitoring cycle for {len(TICKERS)} stocks")
+        alerts_data = self.evaluate_tickers(TICKERS)
+        
+        # Send alerts if any found
+        self.notify(alerts_data)
         
         logging.info("Monitoring cycle completed")
 
-def setup_scheduler(monitor):
+def setup_scheduler(monitor, scheduler: Optional[JobScheduler] = None) -> JobScheduler:
     """Setup the monitoring schedule"""
-    # Run after market close at 5:30 PM ET (30 minutes after close)
-    schedule.every().day.at("17:30").do(monitor.run_monitoring_cycle)
+    scheduler = scheduler or JobScheduler()
+    # Run after market close at 5:30 PM ET (30 minutes after close), on exchange sessions only
+    scheduler.add_job("stock_monitor", monitor.run_monitoring_cycle, at="17:30", run_on=nyse_calendar.is_session)
     
-    # Optional: Run a test check at 6 PM ET
-    # schedule.every().day.at("18:00").do(monitor.run_monitoring_cycle)
-    
-    logging.info("📅 Stock monitoring scheduled for 5:30 PM ET daily")
+    logging.info("📅 Stock monitoring scheduled for 5:30 PM ET on trading days")
+    return scheduler
+
+def profile_session():
+    """ProfileSession (Python/profiling.py) with the monitor stages instrumented"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    python_dir = os.path.join(here, "..", "Python")
+    if python_dir not in sys.path:
+        sys.path.insert(0, python_dir)
+    from profiling import ProfileSession
+
+    session = ProfileSession("stock_monitor", os.path.join(here, "Log"))
+    session.instrument(StockMonitor, "fetch_closes", "fetch")
+    session.instrument(StockMonitor, "check_daily_drop", "daily_drop")
+    session.instrument(StockMonitor, "check_consecutive_decline", "consecutive_decline")
+    session.instrument(StockMonitor, "send_email_alert", "notify")
+    return session
 
 def main():
     """Main function to start the monitoring system"""
@@ -295,26 +344,28 @@ def main():
         print("   For Gmail App Password, visit: https://myaccount.google.com/apppasswords")
         print()
     
+    setup_logging('stock_monitor.log', debug_sample_rate=float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "0")))
     monitor = StockMonitor()
     
     # Run immediate test if requested
-    import sys
-    if len(sys.argv) > 1 and sys.argv[1] == "--test":
+    if "--test" in sys.argv or "--profile" in sys.argv:
         print("🧪 Running test monitoring cycle...")
-        monitor.run_monitoring_cycle()
+        if "--profile" in sys.argv:
+            # Writes cProfile/flamegraph/memory output to Log/profiles/stock_monitor/
+            with profile_session():
+                monitor.run_monitoring_cycle()
+        else:
+            monitor.run_monitoring_cycle()
         return
     
     # Setup scheduler
-    setup_scheduler(monitor)
+    scheduler = setup_scheduler(monitor)
     
     print("✅ System started! Press Ctrl+C to stop.")
     
-    try:
-        while True:
-            schedule.run_pending()
-            time.sleep(60)  # Check every minute
-    except KeyboardInterrupt:
-        print("\n👋 Stock monitoring stopped by user")
+    # Sleeps until the next run is due; returns on Ctrl+C
+    scheduler.run_forever()
+    print("\n👋 Stock monitoring stopped by user")
 
 if __name__ == "__main__":
     main()
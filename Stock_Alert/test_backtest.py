@@ -0,0 +1,18 @@
+import numpy as np
+from backtest import down_streaks, sweep
+
+def test_down_streaks_resets_on_up_or_flat_days():
+    closes = np.array([[5, 4, 3, 3, 2, 1, 2, 1, 0]], dtype=np.float32).T
+    assert down_streaks(closes).ravel().tolist() == [0, 1, 2, 0, 1, 2, 0, 1, 2]
+
+def test_sweep_matches_rules_per_day():
+    # One ticker: -6% drop on day 1, then three down days (days 3-5)
+    closes = np.array([[100, 94, 95, 94, 93, 92, 96]], dtype=np.float32).T
+    results, _ = sweep(closes, thresholds=[0.05], day_counts=[3], horizons=[1])
+    row = results.iloc[0]
+    assert row["drop_alerts"] == 1
+    assert row["decline_alerts"] == 1
+    assert row["alerts"] == 2
+    # Forward 1-day returns after the alerts: 95/94-1 and 96/92-1
+    expected = ((95 / 94 - 1) + (96 / 92 - 1)) / 2 * 100
+    assert abs(row["mean_fwd_1d_%"] - expected) < 1e-3
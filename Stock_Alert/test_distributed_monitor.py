@@ -0,0 +1,81 @@
+from distributed_monitor import HashRing, WorkQueue, merge_alerts
+from price_store import DailyDropAlert
+
+TICKERS = [f"T{i:04d}" for i in range(2000)]
+
+def test_hash_ring_assignment_is_stable():
+    shards = [f"shard-{i:03d}" for i in range(8)]
+    assignment = HashRing(shards).assign(TICKERS)
+    assert HashRing(shards).assign(TICKERS) == assignment
+    assert sorted(t for tickers in assignment.values() for t in tickers) == TICKERS
+
+def test_adding_a_shard_moves_few_tickers():
+    before = HashRing([f"shard-{i:03d}" for i in range(8)])
+    after = HashRing([f"shard-{i:03d}" for i in range(9)])
+    moved = [t for t in TICKERS if before.shard_for(t) != after.shard_for(t)]
+    # ~1/9 of the tickers should move, and only to the new shard
+    assert len(moved) < len(TICKERS) * 0.2
+    assert all(after.shard_for(t) == "shard-008" for t in moved)
+
+def test_claim_is_exclusive(tmp_path):
+    db = str(tmp_path / "queue.db")
+    WorkQueue(db).enqueue("run", {"shard-000": ["AAPL"], "shard-001": ["MSFT"]})
+    first, second = WorkQueue(db), WorkQueue(db)
+
+    claims = [first.claim("w1", 60), second.claim("w2", 60)]
+    assert {c[1] for c in claims} == {"shard-000", "shard-001"}
+    assert first.claim("w1", 60) is None
+
+def test_expired_lease_is_reclaimed_and_stale_complete_ignored(tmp_path):
+    queue = WorkQueue(str(tmp_path / "queue.db"))
+    queue.enqueue("run", {"shard-000": ["AAPL"]})
+    alerts = {'daily_drops': [DailyDropAlert("AAPL", -8.0, 92.0, 100.0)], 'consecutive_declines': []}
+
+    assert queue.claim("w1", 60) == ("run", "shard-000", ["AAPL"])
+    assert queue.claim("w2", 60) is None
+    # Lease of 0s: w1's lease has expired, w2 takes the task over
+    assert queue.claim("w2", 0) == ("run", "shard-000", ["AAPL"])
+
+    queue.complete("run", "shard-000", "w1", alerts)
+    assert queue.remaining("run") == 1
+    assert queue.results("run") == []
+
+    queue.complete("run", "shard-000", "w2", alerts)
+    assert queue.remaining("run") == 0
+    assert queue.results("run") == [alerts]
+
+def test_merge_alerts_orders_by_ticker():
+    results = [
+        {'daily_drops': [DailyDropAlert("MSFT", -6.0, 94.0, 100.0)], 'consecutive_declines': []},
+        {'daily_drops': [DailyDropAlert("AAPL", -7.0, 93.0, 100.0)], 'consecutive_declines': []},
+    ]
+    assert [a.ticker for a in merge_alerts(results)['daily_drops']] == ["AAPL", "MSFT"]
+
+def test_newest_run_is_claimed_first_and_abandoned_runs_are_skipped(tmp_path):
+    queue = WorkQueue(str(tmp_path / "queue.db"))
+    queue.enqueue("20250710-173000-000000", {"shard-000": ["AAPL"]})
+    queue.enqueue("20250711-173000-000000", {"shard-000": ["MSFT"]})
+
+    assert queue.claim("w1", 60)[0] == "20250711-173000-000000"
+    assert queue.abandon("20250710-173000-000000") == 1
+    assert queue.remaining("20250710-173000-000000") == 0
+    assert queue.claim("w1", 60) is None
+
+def test_task_fails_after_max_attempts(tmp_path):
+    queue = WorkQueue(str(tmp_path / "queue.db"))
+    queue.enqueue("run", {"shard-000": ["AAPL"], "shard-001": ["MSFT"]})
+
+    assert queue.claim("w1", 0, max_attempts=2)[1] == "shard-000"
+    assert queue.claim("w2", 0, max_attempts=2)[1] == "shard-000"  # w1's lease expired
+    # Second expiry: shard-000 is failed rather than leased a third time
+    assert queue.claim("w3", 0, max_attempts=2)[1] == "shard-001"
+    assert queue.failed("run") == ["shard-000"]
+
+def test_purge_removes_older_runs(tmp_path):
+    queue = WorkQueue(str(tmp_path / "queue.db"))
+    queue.enqueue("20250701-173000-000000", {"shard-000": ["AAPL"]})
+    queue.enqueue("20250711-173000-000000", {"shard-000": ["AAPL"]})
+
+    assert queue.purge("20250704-000000-000000") == 1
+    assert queue.remaining("20250701-173000-000000") == 0
+    assert queue.remaining("20250711-173000-000000") == 1
@@ -0,0 +1,26 @@
+import json
+from datetime import date, datetime
+
+from job_scheduler import Job, JobScheduler
+
+def weekdays(day: date) -> bool:
+    return day.weekday() < 5
+
+def test_scheduled_after_skips_non_run_days():
+    job = Job("monitor", lambda: None, "17:30", weekdays)
+    # Friday after the run time -> next Monday
+    assert job.scheduled_after(datetime(2025, 7, 11, 18, 0)) == datetime(2025, 7, 14, 17, 30)
+    assert job.scheduled_after(datetime(2025, 7, 14, 9, 0)) == datetime(2025, 7, 14, 17, 30)
+
+def test_missed_run_is_caught_up_within_window(tmp_path):
+    state_file = tmp_path / "state.json"
+    state_file.write_text(json.dumps({"monitor": {"last_scheduled": "2025-07-10T17:30:00"}}))
+    scheduler = JobScheduler(state_file=str(state_file))
+    scheduler.add_job("monitor", lambda: None, at="17:30", run_on=weekdays)
+    job = scheduler.jobs[0]
+
+    assert scheduler._missed_run(job, datetime(2025, 7, 11, 19, 0)) == datetime(2025, 7, 11, 17, 30)
+    # Too late to be useful: outside the 6 hour catch-up window
+    assert scheduler._missed_run(job, datetime(2025, 7, 12, 9, 0)) is None
+    # Nothing missed yet
+    assert scheduler._missed_run(job, datetime(2025, 7, 11, 12, 0)) is None
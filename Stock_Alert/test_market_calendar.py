@@ -0,0 +1,34 @@
+from datetime import date, time
+
+import pytest
+from market_calendar import nyse_calendar
+
+def test_weekends_and_holidays_are_not_sessions():
+    assert not nyse_calendar.is_session(date(2025, 7, 5))    # Saturday
+    assert not nyse_calendar.is_session(date(2025, 4, 18))   # Good Friday
+    assert not nyse_calendar.is_session(date(2025, 11, 27))  # Thanksgiving
+    assert not nyse_calendar.is_session(date(2025, 1, 9))    # Special closure
+    assert nyse_calendar.is_session(date(2025, 7, 7))
+
+def test_observed_holidays():
+    # July 4th 2026 is a Saturday -> observed Friday
+    assert not nyse_calendar.is_session(date(2026, 7, 3))
+    # New Year's Day 2022 was a Saturday -> not observed, Dec 31 2021 traded
+    assert nyse_calendar.is_session(date(2021, 12, 31))
+
+def test_early_closes():
+    assert nyse_calendar.close_time(date(2025, 11, 28)) == time(13, 0)
+    assert nyse_calendar.close_time(date(2025, 11, 26)) == time(16, 0)
+    assert nyse_calendar.close_time(date(2025, 11, 27)) is None
+
+def test_sessions_back_skips_closed_days():
+    # Monday after a weekend that follows Good Friday
+    assert nyse_calendar.sessions_back(date(2025, 4, 21), 3) == [
+        date(2025, 4, 16), date(2025, 4, 17), date(2025, 4, 21)
+    ]
+    # Asking from a closed day ends on the previous session
+    assert nyse_calendar.sessions_back(date(2025, 4, 19), 1) == [date(2025, 4, 17)]
+
+def test_out_of_range():
+    with pytest.raises(ValueError):
+        nyse_calendar.sessions_back(date(1999, 6, 1), 2)
@@ -0,0 +1,28 @@
+import json
+
+import pytest
+
+from price_store import ConsecutiveDeclineAlert, DailyDropAlert, alerts_from_rows, alerts_to_rows
+
+def test_alert_rows_round_trip_through_json():
+    alerts_data = {
+        'daily_drops': [DailyDropAlert("AAPL", -6.25, 187.5, 200.0)],
+        'consecutive_declines': [ConsecutiveDeclineAlert("TSLA", 4, 210.0, 250.0, -16.0),
+                                 ConsecutiveDeclineAlert("NVDA", 3, 99.5, 110.0, -9.55)],
+    }
+    # Shard results are stored in SQLite as JSON
+    rows = json.loads(json.dumps(alerts_to_rows(alerts_data)))
+    assert alerts_from_rows(rows) == alerts_data
+
+def test_empty_alerts_round_trip():
+    alerts_data = {'daily_drops': [], 'consecutive_declines': []}
+    assert alerts_from_rows(alerts_to_rows(alerts_data)) == alerts_data
+
+def test_price_matrix_column_drops_missing_sessions():
+    np = pytest.importorskip("numpy")
+    from price_store import PriceMatrix
+
+    dates = np.array(["2025-07-09", "2025-07-10", "2025-07-11"], dtype="datetime64[D]")
+    prices = PriceMatrix(dates, ["AAPL", "GONE"], np.array([[1.0, np.nan], [np.nan, np.nan], [3.0, np.nan]]))
+    assert prices.column("AAPL").tolist() == [1.0, 3.0]
+    assert len(prices.column("GONE")) == 0